@@ -14,6 +14,8 @@ sys.path.append("../..")
 sys.path.append("../../..")
 from utils.types import TaskData
 
+from web_agent.browser import shutdown_all
+from web_agent.llm import LLMClient
 from web_agent.web_agent import WebAgent
 
 
@@ -68,6 +70,8 @@ async def main(max_concurrent_tasks: int, output_dir: str) -> None:
             asyncio.create_task(run_task_with_semaphore(task, semaphore, output_dir))
         )
     await asyncio.gather(*asyncio_tasks, return_exceptions=True)
+    await shutdown_all()
+    await LLMClient.aclose_all()
 
 
 if __name__ == "__main__":
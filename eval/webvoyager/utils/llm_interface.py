@@ -35,7 +35,7 @@ def prepare_initial_evaluation_messages(
     """Prepares the messages list for the initial LLM evaluation call."""
     screenshot_dir = os.path.join(process_dir, "screenshots")
     screenshot_files = sorted(
-        [f for f in os.listdir(screenshot_dir) if f.endswith(".png")]
+        [f for f in os.listdir(screenshot_dir) if f.endswith((".png", ".jpg"))]
     )
 
     # Ensure img_num does not exceed available screenshots
@@ -46,10 +46,11 @@ def prepare_initial_evaluation_messages(
     for png_file in end_files:
         try:
             b64_img = encode_image(os.path.join(screenshot_dir, png_file))
+            mime_type = "image/jpeg" if png_file.endswith(".jpg") else "image/png"
             whole_content_img.append(
                 {
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{b64_img}"},
+                    "image_url": {"url": f"data:{mime_type};base64,{b64_img}"},
                 }
             )
         except FileNotFoundError:
@@ -1,6 +1,8 @@
 import asyncio
 
 from web_agent import WebAgent
+from web_agent.browser import shutdown_all
+from web_agent.llm import LLMClient
 
 
 async def main():
@@ -10,6 +12,8 @@ async def main():
     )
 
     await agent.run()
+    await shutdown_all()
+    await LLMClient.aclose_all()
 
 
 if __name__ == "__main__":
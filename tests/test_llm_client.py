@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from web_agent.llm.client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "What is on the page?"}]
+
+
+def test_in_flight_waiters_retry_when_caller_is_cancelled(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    async def run():
+        client = LLMClient()
+        calls = 0
+
+        async def make_uncached_call(*args):
+            nonlocal calls
+            calls += 1
+            call = calls
+            if call == 1:
+                # The first call hangs until its caller is cancelled
+                await asyncio.Event().wait()
+            await asyncio.sleep(0)
+            return f"response {call}"
+
+        client._make_uncached_call = make_uncached_call
+
+        caller = asyncio.create_task(client.make_call(MESSAGES, "gpt-4o"))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(client.make_call(MESSAGES, "gpt-4o")) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # One waiter makes the call again and the others share its result
+        assert await asyncio.gather(*waiters) == ["response 2"] * 3
+        assert calls == 2
+        assert not client.in_flight_calls
+
+    asyncio.run(run())
@@ -1,6 +1,6 @@
-import json
 from typing import List
 
+import orjson
 from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
 
 from web_agent.agent.utils.prompt_formatting import (
@@ -24,7 +24,7 @@ async def get_action_choice_prompt(browser: AgentBrowser, goal: str) -> str:
     interactable_elements = get_formatted_interactable_elements(
         pixels_above, pixels_below, page.elements
     )
-    tabs = await get_formatted_tabs(browser)
+    tabs = get_formatted_tabs(browser)
     return f"""OPEN BROWSER TABS:
 {tabs}
 
@@ -97,7 +97,7 @@ class ActionChooser:
 
         tool_call = tool_call_message.tool_calls[0]
 
-        args = json.loads(tool_call.function.arguments)
+        args = orjson.loads(tool_call.function.arguments)
 
         action = AgentAction(
             name=tool_call.function.name,
@@ -136,7 +136,7 @@ async def get_next_goal_prompt(browser: AgentBrowser) -> str:
     interactable_elements = get_formatted_interactable_elements(
         pixels_above, pixels_below, page.elements
     )
-    tabs = await get_formatted_tabs(browser)
+    tabs = get_formatted_tabs(browser)
     return f"""OPEN BROWSER TABS:
 {tabs}
 
@@ -194,7 +194,7 @@ async def evaluate_goal_completion_prompt(browser: AgentBrowser, goal: str) -> s
     interactable_elements = get_formatted_interactable_elements(
         pixels_above, pixels_below, page.elements
     )
-    tabs = await get_formatted_tabs(browser)
+    tabs = get_formatted_tabs(browser)
     return f"""OPEN BROWSER TABS:
 {tabs}
 
@@ -245,7 +245,7 @@ async def evaluate_goal_validity_prompt(browser: AgentBrowser, goal: str) -> str
     interactable_elements = get_formatted_interactable_elements(
         pixels_above, pixels_below, page.elements
     )
-    tabs = await get_formatted_tabs(browser)
+    tabs = get_formatted_tabs(browser)
     return f"""OPEN BROWSER TABS:
 {tabs}
 
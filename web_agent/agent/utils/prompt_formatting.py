@@ -3,6 +3,18 @@ from typing import List
 
 from web_agent.models import BrowserTab
 
+# Scroll position descriptions keyed by (has_content_above, has_content_below)
+_PAGE_POSITIONS = {
+    (True, True): "You are in the middle of the page.",
+    (True, False): "You are at the bottom of the page.",
+    (False, True): "You are at the top of the page.",
+    (False, False): "The entire page is visible. No scrolling is needed/possible.",
+}
+
+# Markers placed around the element list when there is more content off-screen
+_CONTENT_ABOVE = "... {} pixels above - scroll up to see more ..."
+_CONTENT_BELOW = "... {} pixels below - scroll down to see more ..."
+
 
 def get_formatted_interactable_elements(pixels_above, pixels_below, elements) -> str:
     """
@@ -16,28 +28,27 @@ def get_formatted_interactable_elements(pixels_above, pixels_below, elements) ->
     Returns:
         A formatted string representation of interactable elements
     """
-    element_descriptions = {
-        element_id: element["simplified_html"]
-        for element_id, element in elements.items()
-    }
     has_content_above = pixels_above > 0
     has_content_below = pixels_below > 0
 
-    # Format the elements in a more readable way
-    elements_text = ""
-    if element_descriptions:
-        for element_id, html in element_descriptions.items():
-            elements_text += f"- Element {element_id}: {html}\n"
-        elements_text = elements_text.rstrip()  # Remove trailing newline
+    # Format the elements in a more readable way. Only elements in the viewport
+    # are listed, so a single join is cheaper than streaming into a buffer.
+    elements_text = "\n".join(
+        f"- Element {element_id}: {element['simplified_html']}"
+        for element_id, element in elements.items()
+    ).rstrip()
     if elements_text:
-        if has_content_above:
-            elements_text = f"... {pixels_above} pixels above - scroll up to see more ...\n{elements_text}"
-        else:
-            elements_text = f"[Top of page]\n{elements_text}"
-        if has_content_below:
-            elements_text = f"{elements_text}\n... {pixels_below} pixels below - scroll down to see more ..."
-        else:
-            elements_text = f"{elements_text}\n[Bottom of page]"
+        header = (
+            _CONTENT_ABOVE.format(pixels_above)
+            if has_content_above
+            else "[Top of page]"
+        )
+        footer = (
+            _CONTENT_BELOW.format(pixels_below)
+            if has_content_below
+            else "[Bottom of page]"
+        )
+        elements_text = f"{header}\n{elements_text}\n{footer}"
     else:
         elements_text = "None"
 
@@ -54,33 +65,23 @@ def get_formatted_page_position(pixels_above, pixels_below) -> str:
     Returns:
         A human-readable description of the current scroll position
     """
-    has_content_above = pixels_above > 0
-    has_content_below = pixels_below > 0
-
-    if has_content_above and has_content_below:
-        page_position = "You are in the middle of the page."
-    elif has_content_above:
-        page_position = "You are at the bottom of the page."
-    elif has_content_below:
-        page_position = "You are at the top of the page."
-    else:
-        page_position = "The entire page is visible. No scrolling is needed/possible."
-
-    return page_position
+    return _PAGE_POSITIONS[(pixels_above > 0, pixels_below > 0)]
 
 
-async def get_formatted_tabs(browser) -> List[BrowserTab]:
+def get_formatted_tabs(browser) -> List[BrowserTab]:
     """
     Get a formatted string of tabs in the browser.
+
+    Titles are read from each page's cached title, so no browser round-trips
+    are made while building the prompt.
     """
-    tabs = []
-    for i, page in enumerate(browser.pages):
-        tabs.append(
-            BrowserTab(
-                index=i,
-                title=await page.page.title(),
-                url=page.get_shortened_url(),
-                is_focused=browser.current_page_index == i,
-            )
+    current_page_index = browser.current_page_index
+    return [
+        BrowserTab(
+            index=i,
+            title=page.title,
+            url=page.get_shortened_url(),
+            is_focused=current_page_index == i,
         )
-    return tabs
+        for i, page in enumerate(browser.pages)
+    ]
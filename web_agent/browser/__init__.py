@@ -1,6 +1,6 @@
 # Export submodules for direct access if needed
 from . import actions
-from .core.browser import AgentBrowser
+from .core.browser import AgentBrowser, shutdown_all
 from .core.tools import TOOLS
 
-__all__ = ["AgentBrowser", "TOOLS"]
+__all__ = ["AgentBrowser", "TOOLS", "shutdown_all"]
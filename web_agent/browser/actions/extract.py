@@ -1,22 +1,29 @@
-import markdownify
 from playwright.async_api import Page
 
 from web_agent.browser.core.page import browser_action
 from web_agent.llm import LLMClient
 
+# The static parts of the extraction prompt, assembled around the query and page content
+_PROMPT_PREFIX = "You are a specialized text extraction assistant. Your task is to find and extract information pertaining to the following query: "
+_PROMPT_MIDDLE = """.
+
+If there is no information on the page pertaining to the query, say so. Do not try to answer the query based on information not in the page content.
+
+Here is the page content in markdown format:
+"""
+
 
 @browser_action
 async def extract(page: Page, llm_client: LLMClient, information_to_extract: str):
+    # Imported lazily since markdownify pulls in BeautifulSoup
+    import markdownify
+
     page_content = await page.content()
     markdown_content = markdownify.markdownify(page_content)
 
-    prompt = f"""You are a specialized text extraction assistant. Your task is to find and extract information pertaining to the following query: {information_to_extract}.
-
-If there is no information on the page pertaining to the query, say so. Do not try to answer the query based on information not in the page content.
-
-Here is the page content in markdown format:
-{markdown_content}
-"""
+    prompt = "".join(
+        (_PROMPT_PREFIX, information_to_extract, _PROMPT_MIDDLE, markdown_content, "\n")
+    )
     response = await llm_client.make_call(
         [{"role": "user", "content": prompt}],
         "gpt-4.1",
@@ -5,6 +5,7 @@ Input actions for interacting with form fields and text inputs.
 from playwright.async_api import Page
 
 from web_agent.browser.core.page import browser_action
+from web_agent.browser.utils.selectors import ELEMENT_SELECTOR
 
 
 @browser_action
@@ -18,7 +19,7 @@ async def type_text(page: Page, element_id: str, text: str, submit: bool = False
         text: Text to type into the field
     """
     # Format the selector properly based on input type
-    selector = f'[data-gwa-id="gwa-element-{element_id}"]'
+    selector = ELEMENT_SELECTOR.format(element_id)
 
     await page.fill(selector, text)
     if submit:
@@ -5,6 +5,7 @@ Interaction actions for clicking and hovering over elements.
 from playwright.async_api import Page
 
 from web_agent.browser.core.page import browser_action
+from web_agent.browser.utils.selectors import ELEMENT_SELECTOR
 
 
 async def hover_element(page: Page, selector: str):
@@ -28,7 +29,7 @@ async def click_element(page: Page, element_id: str):
         page: The Playwright page
         element_id: The unique ID of the element to click
     """
-    selector = f'[data-gwa-id="gwa-element-{element_id}"]'
+    selector = ELEMENT_SELECTOR.format(element_id)
 
     # First try to find and click the element in the main frame
     if await page.locator(selector).count() > 0:
@@ -6,6 +6,11 @@ from playwright.async_api import Page
 
 from web_agent.browser.core.page import browser_action
 
+# A single-entry history has nothing to go back or forward to. The Navigation
+# API's canGoBack/canGoForward aren't used since they ignore cross-origin
+# entries.
+_HAS_HISTORY_JS = "window.history.length > 1"
+
 
 @browser_action
 async def go_to_url(page: Page, url: str):
@@ -25,32 +30,50 @@ async def navigate(page: Page, direction: str):
     Navigate the browser in a specified direction.
     """
     if direction == "back":
-        await go_back(page)
+        if not await go_back(page):
+            return "There is no previous page to go back to."
     elif direction == "forward":
-        await go_forward(page)
+        if not await go_forward(page):
+            return "There is no next page to go forward to."
 
 
-async def go_back(page: Page):
+async def go_back(page: Page) -> bool:
     """
     Navigate back to the previous page in history.
 
     Args:
         page: The Playwright page
+
+    Returns:
+        False if there was no history to go back to, True otherwise
     """
+    if not await page.evaluate(_HAS_HISTORY_JS):
+        return False
     previous_url = page.url
-    await page.go_back()
+    # update_page_state waits for the page to settle afterwards, so only wait
+    # for the DOM here rather than the full load event
+    await page.go_back(wait_until="domcontentloaded")
     if page.url == previous_url:
-        await page.go_back()
+        await page.go_back(wait_until="domcontentloaded")
+    return True
 
 
-async def go_forward(page: Page):
+async def go_forward(page: Page) -> bool:
     """
     Navigate forward to the next page in history.
 
     Args:
         page: The Playwright page
+
+    Returns:
+        False if there was no history to go forward to, True otherwise
     """
+    if not await page.evaluate(_HAS_HISTORY_JS):
+        return False
     previous_url = page.url
-    await page.go_forward()
+    # update_page_state waits for the page to settle afterwards, so only wait
+    # for the DOM here rather than the full load event
+    await page.go_forward(wait_until="domcontentloaded")
     if page.url == previous_url:
-        await page.go_forward()
+        await page.go_forward(wait_until="domcontentloaded")
+    return True
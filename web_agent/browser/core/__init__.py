@@ -2,6 +2,6 @@
 Core browser implementation modules.
 """
 
-from .browser import AgentBrowser
+from .browser import AgentBrowser, shutdown_all
 
-__all__ = ["AgentBrowser"]
+__all__ = ["AgentBrowser", "shutdown_all"]
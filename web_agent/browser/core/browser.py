@@ -5,24 +5,72 @@ This module provides the main AgentBrowser class that handles browser initializa
 page navigation, and interaction with web elements through various actions.
 """
 
+import asyncio
 import logging
-import sys
-from typing import List, Optional, cast
-
-from camoufox.async_api import AsyncCamoufox
-from playwright.async_api import (
-    Browser,
-    BrowserContext,
-    Page,
-)
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, cast
 
 from web_agent.browser.core.page import AgentBrowserPage
+from web_agent.browser.core.tools import TOOL_NAMES
 from web_agent.llm.client import LLMClient
 from web_agent.models import AgentAction
 
+if TYPE_CHECKING:
+    # Camoufox is only imported for real in _get_browser(), so code paths that
+    # never start a browser don't load it. Playwright is already imported by
+    # page.py, so its types are only needed here for annotations.
+    from camoufox.async_api import AsyncCamoufox
+    from playwright.async_api import Browser, BrowserContext, Page
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Viewport size of every agent's pages
+_VIEWPORT_SIZE = {"width": 1200, "height": 1600}
+
+# Browsers shared by every AgentBrowser in the process, keyed by headless mode.
+# Each agent gets its own BrowserContext on top of the shared browser.
+_shared_browsers: Dict[bool, Tuple["AsyncCamoufox", "Browser"]] = {}
+_shared_browsers_lock = asyncio.Lock()
+
+
+async def _get_browser(headless: bool) -> "Browser":
+    """
+    Get the shared browser for the given mode, launching it on first use.
+
+    Args:
+        headless: Whether the browser should run headless
+
+    Returns:
+        The shared Playwright browser
+    """
+    async with _shared_browsers_lock:
+        shared = _shared_browsers.get(headless)
+        if shared and shared[1].is_connected():
+            return shared[1]
+
+        from camoufox.async_api import AsyncCamoufox
+
+        # Camoufox instance manages Playwright and browser launch options
+        camoufox = AsyncCamoufox(
+            headless=headless,
+            window=(1200, 1600),
+        )
+        # Use Camoufox context manager entry to launch browser
+        browser = cast("Browser", await camoufox.__aenter__())
+        if not browser:
+            raise RuntimeError("Camoufox failed to launch the browser.")
+
+        _shared_browsers[headless] = (camoufox, browser)
+        return browser
+
+
+async def shutdown_all() -> None:
+    """Close all shared browsers and stop Playwright. Call once at process exit."""
+    async with _shared_browsers_lock:
+        for camoufox, _ in _shared_browsers.values():
+            await camoufox.__aexit__(None, None, None)
+        _shared_browsers.clear()
+
 
 class AgentBrowser:
     """
@@ -41,24 +89,23 @@ class AgentBrowser:
         llm_client: LLMClient,
     ):
         """Initialize the browser controller."""
-        # Camoufox instance manages Playwright and browser launch options
-        self.camoufox = AsyncCamoufox(
-            headless=headless,
-            window=(1200, 1600),
-        )
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
+        self.browser: Optional["Browser"] = None
+        self.context: Optional["BrowserContext"] = None
 
         self.current_page_index = 0
         self.pages: List[AgentBrowserPage] = []
+        self._current_page: Optional[AgentBrowserPage] = None
+
+        # Actions handled by the browser itself rather than the current page
+        self._browser_actions = {
+            "switch_tab": lambda args: self.switch_tab(args["tab_index"]),
+        }
 
         self.llm_client = llm_client
 
         self.output_dir = output_dir
         self.initial_url = initial_url
-        self.headless = (
-            headless  # Keep for potential other uses, though Camoufox handles it now
-        )
+        self.headless = headless  # Selects which shared browser to use
 
     # Browser lifecycle methods
     # ------------------------------------------------------------------------
@@ -67,23 +114,23 @@ class AgentBrowser:
         """
         Launch the browser and navigate to the initial URL.
         """
-        # Use Camoufox context manager entry to launch browser
-        self.browser = cast(Browser, await self.camoufox.__aenter__())
-
-        # Ensure browser is launched before creating context
-        if not self.browser:
-            raise RuntimeError("Camoufox failed to launch the browser.")
-
-        self.context = await self.browser.new_context()
+        self.browser = await _get_browser(self.headless)
+        # Screenshot cropping and scrolling assume this viewport size
+        self.context = await self.browser.new_context(viewport=_VIEWPORT_SIZE)
 
         await self.create_new_page(self.initial_url)
 
         self.context.on("page", self.handle_new_page_event)
 
     async def terminate(self):
-        """Close browser and playwright resources using Camoufox context exit."""
-        # Use Camoufox context manager exit to close browser and stop Playwright
-        await self.camoufox.__aexit__(*sys.exc_info())
+        """
+        Close this agent's browser context.
+
+        The shared browser keeps running for other agents; use shutdown_all()
+        to close it.
+        """
+        if self.context:
+            await self.context.close()
         self.browser = None  # Ensure state reflects closure
         self.context = None
 
@@ -96,16 +143,18 @@ class AgentBrowser:
         browser_page = AgentBrowserPage(page, self.llm_client, self.output_dir)
         self.pages.append(browser_page)
         self.current_page_index = len(self.pages) - 1
+        self._current_page = browser_page
 
         await browser_page.go_to_url(url)
         await browser_page.update_page_state()
 
-    async def handle_new_page_event(self, page: Page):
+    async def handle_new_page_event(self, page: "Page"):
         """Handle page events."""
         logger.info("New tab opened")
         browser_page = AgentBrowserPage(page, self.llm_client, self.output_dir)
         self.pages.append(browser_page)
         self.current_page_index = len(self.pages) - 1
+        self._current_page = browser_page
         await browser_page.update_page_state()
 
     # Action execution
@@ -122,17 +171,21 @@ class AgentBrowser:
             A string representation of the action result
         """
 
+        if action.name not in TOOL_NAMES:
+            raise ValueError(f"Unknown action: {action.name}")
+
         action_response = ""
-        if action.name == "end_task":
-            pass
-        elif action.name == "switch_tab":
-            await self.switch_tab(action.args["tab_index"])
+        browser_handler = self._browser_actions.get(action.name)
+        if browser_handler:
+            await browser_handler(action.args)
         else:
-            action_response = await getattr(self.current_page, action.name)(
-                **action.args
-            )
+            handler = self.current_page.get_action(action.name)
+            if handler is None:
+                raise ValueError(f"Action {action.name} is not supported by the page")
+            action_response = await handler(**action.args)
 
-        # Update the browser state after the action completes
+        # Update the browser state after the action completes. The current page
+        # is re-read here since the action may have switched or opened a tab.
         await self.current_page.update_page_state(
             force_update_page_overview=action.name == "click_element"
         )
@@ -153,6 +206,7 @@ class AgentBrowser:
         if 0 <= tab_index < len(self.pages):
             target_page = self.pages[tab_index]
             self.current_page_index = tab_index
+            self._current_page = target_page
             await target_page.page.bring_to_front()
         else:
             raise IndexError(
@@ -161,8 +215,7 @@ class AgentBrowser:
 
     async def check_for_captcha(self) -> bool:
         """Check if a captcha is present on the current page."""
-        current_page = self.pages[self.current_page_index]
-        return await current_page.check_for_captcha()
+        return await self.current_page.check_for_captcha()
 
     async def update_page_state(self):
         """Update the page state for all pages."""
@@ -179,6 +232,6 @@ class AgentBrowser:
         Raises:
             IndexError: If there are no open pages
         """
-        if not self.pages:
+        if self._current_page is None:
             raise IndexError("No browser pages are open")
-        return self.pages[self.current_page_index]
+        return self._current_page
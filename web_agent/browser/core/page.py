@@ -1,18 +1,19 @@
 import asyncio
 import base64
 import io
-import json
 import logging
 from datetime import datetime
-from typing import Any, List, Tuple
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from PIL import Image
+from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Page
 
 from web_agent.browser.utils.preprocess_page import get_page_overview, preprocess_page
 from web_agent.browser.utils.screenshot import take_screenshot
-from web_agent.llm.client import LLMClient
+from web_agent.llm.client import IMAGE_QUALITY_SETTINGS, LLMClient, downsample_image
+from web_agent.models import CaptchaDetection
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,10 @@ class BrowserActions:
     def get(cls, name):
         return cls._registry.get(name)
 
+    @classmethod
+    def items(cls):
+        return cls._registry.items()
+
 
 class AgentBrowserPage:
     def __init__(self, page: Page, llm_client: LLMClient, output_dir: str):
@@ -47,10 +52,19 @@ class AgentBrowserPage:
         self.previous_page_url = ""
         self.page_summary = ""
         self.page_breakdown = ""
+        self.title = ""  # Cached page title, refreshed on load and state updates
         self.output_dir = output_dir
 
         self.is_new_page = False  # Whether the current page's url is different from the previous page's url
 
+        self.page.on("load", self._refresh_title)
+
+        # Bind every registered action once so dispatch is a single dict lookup
+        self._action_dispatch = {
+            name: self._build_action_wrapper(name, func)
+            for name, func in BrowserActions.items()
+        }
+
     def __getattr__(self, name: str) -> Any:
         """
         Dynamic method resolution for browser actions.
@@ -66,38 +80,56 @@ class AgentBrowserPage:
         Raises:
             AttributeError: If the method name is not in the method map
         """
-        action_func = BrowserActions.get(name)
-        if action_func:
-            # Return an async wrapper that automatically passes self.page
-            async def wrapper(*args: Any, **kwargs: Any) -> Any:
-                if not self.page:
-                    raise RuntimeError("Browser page is not initialized")
-                if name == "find":
-                    return await action_func(
-                        page=self.page,
-                        full_page_screenshot_crops=self.get_full_page_screenshot_crops(),
-                        page_height=Image.open(
-                            io.BytesIO(base64.b64decode(self.full_page_screenshot))
-                        ).height,
-                        llm_client=self.llm_client,
-                        *args,
-                        **kwargs,
-                    )
-                elif name == "extract":
-                    return await action_func(
-                        page=self.page,
-                        llm_client=self.llm_client,
-                        *args,
-                        **kwargs,
-                    )
-                else:
-                    return await action_func(self.page, *args, **kwargs)
-
-            return wrapper
+        action = self.__dict__.get("_action_dispatch", {}).get(name)
+        if action:
+            return action
         raise AttributeError(
             f"'{self.__class__.__name__}' object has no attribute '{name}'"
         )
 
+    def get_action(self, name: str) -> Optional[Callable[..., Awaitable[Any]]]:
+        """
+        Look up a registered browser action by name.
+
+        Args:
+            name: The name of the action
+
+        Returns:
+            The bound action wrapper, or None if no action has that name
+        """
+        return self._action_dispatch.get(name)
+
+    def _build_action_wrapper(
+        self, name: str, action_func: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """Return an async wrapper that automatically passes self.page"""
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self.page:
+                raise RuntimeError("Browser page is not initialized")
+            if name == "find":
+                return await action_func(
+                    page=self.page,
+                    full_page_screenshot_crops=self.get_full_page_screenshot_crops(),
+                    page_height=Image.open(
+                        io.BytesIO(base64.b64decode(self.full_page_screenshot))
+                    ).height,
+                    llm_client=self.llm_client,
+                    *args,
+                    **kwargs,
+                )
+            elif name == "extract":
+                return await action_func(
+                    page=self.page,
+                    llm_client=self.llm_client,
+                    *args,
+                    **kwargs,
+                )
+            else:
+                return await action_func(self.page, *args, **kwargs)
+
+        return wrapper
+
     async def update_page_state(self, force_update_page_overview: bool = False) -> None:
         """
         Update the page state with the current screenshot and annotated screenshot.
@@ -109,7 +141,7 @@ class AgentBrowserPage:
 
         tasks = []
         if self.previous_page_url != self.page.url or force_update_page_overview:
-            save_path = f"{self.output_dir}/full_page_screenshots/{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            save_path = f"{self.output_dir}/full_page_screenshots/{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
             full_page_screenshot = await take_screenshot(
                 self.page, save_path=save_path, full_page=True
             )
@@ -150,6 +182,16 @@ class AgentBrowserPage:
         self.bounding_box_screenshot = bounding_box_screenshot
         self.elements = elements
         self.previous_page_url = self.page.url
+        self.title = await self.page.title()
+
+    async def _refresh_title(self, _page: Page) -> None:
+        """Refresh the cached title when the page fires a load event."""
+        try:
+            self.title = await self.page.title()
+        except PlaywrightError:
+            # The tab closed or navigated again before the handler ran, so keep
+            # the previously cached title
+            pass
 
     def get_base_url(self) -> str:
         """
@@ -223,25 +265,23 @@ Look for:
 - Text asking to verify you're human
 - Checkboxes for "I'm not a robot"
 - Image selection challenges
-
-Respond with a JSON object:
-{
-    "reasoning": "brief explanation of why you think this is or isn't a captcha",
-    "is_captcha": true/false,
-}
 """
         # Create message with image
+        # A downscaled screenshot is enough to recognize a captcha. It's
+        # re-encoded in a worker thread to keep the event loop free.
+        screenshot = await asyncio.to_thread(
+            downsample_image, self.screenshot, *IMAGE_QUALITY_SETTINGS["medium"]
+        )
         user_message = self.llm_client.create_user_message_with_images(
-            captcha_prompt, [self.screenshot]
+            captcha_prompt, [screenshot], detail="low"
         )
 
-        response = await self.llm_client.make_call([user_message], "gpt-4o", timeout=10)
-        if not response.content:
-            raise ValueError("Empty response content")
-        response_json = json.loads(response.content)
+        captcha_detection = await self.llm_client.make_structured_call(
+            [user_message], "gpt-4o", CaptchaDetection, timeout=10
+        )
 
         # Return the captcha detection result
-        return response_json.get("is_captcha", False)
+        return captcha_detection.is_captcha
 
     async def get_pixels_above_below(self) -> Tuple[int, int]:
         """
@@ -176,3 +176,6 @@ TOOLS = [
         },
     },
 ]
+
+# Names of all tools the LLM can call, for validating its chosen action
+TOOL_NAMES: frozenset[str] = frozenset(tool["function"]["name"] for tool in TOOLS)
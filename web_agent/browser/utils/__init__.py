@@ -2,6 +2,6 @@
 Utility functions for browser operations.
 """
 
-from . import preprocess_page, screenshot
+from . import preprocess_page, screenshot, selectors
 
-__all__ = ["preprocess_page", "screenshot"]
+__all__ = ["preprocess_page", "screenshot", "selectors"]
@@ -9,15 +9,23 @@
     );
   }
 
-  // Clear any existing annotations first
-  const removeElementsByClass = (className) => {
-    const elements = Array.from(document.querySelectorAll(className));
-    elements.forEach((element) => {
-      element.remove();
-    });
-  };
-  removeElementsByClass(".GWA-rect");
-  removeElementsByClass(".GWA-label");
+  // Clear any existing annotations first. All annotations live in the shadow
+  // root of a single host element, so clearing them is one removal.
+  document.getElementById("gwa-overlay-root")?.remove();
+  const host = document.createElement("div");
+  host.id = "gwa-overlay-root";
+  host.style.position = "absolute";
+  host.style.top = "0px";
+  host.style.left = "0px";
+  host.style.width = "0px";
+  host.style.height = "0px";
+  host.style.zIndex = "2147483647";
+  host.style.pointerEvents = "none";
+  const root = host.attachShadow({ mode: "open" });
+  document.body.appendChild(host);
+
+  // Build all annotations off-document and attach them in one append
+  const fragment = document.createDocumentFragment();
 
   // Draw new annotations
   indices.forEach((index) => {
@@ -42,7 +50,7 @@
     newElement.style.zIndex = "2147483647";
     newElement.style.pointerEvents = "none";
     newElement.style.backgroundColor = "rgba(165, 42, 42, 0.1)";
-    document.body.appendChild(newElement);
+    fragment.appendChild(newElement);
 
     // Create label with index number
     const label = document.createElement("span");
@@ -66,8 +74,9 @@
       label.style.left = `${adjustedLeft}px`;
     }
 
-    document.body.appendChild(label);
+    fragment.appendChild(label);
   });
+  root.appendChild(fragment);
 
   return indices.length;
 };
@@ -0,0 +1,71 @@
+({ startingIndex, maxElements, attrs, booleanAttrs, textyAttrs }) => {
+  // Truncate long attribute-derived text in the page so large values (e.g.
+  // data URIs or JSON blobs) are never serialized back to Python
+  function truncate(text) {
+    return text.length > 50 ? text.substring(0, 47) + "..." : text;
+  }
+
+  const results = [];
+  const elements = document.querySelectorAll(
+    "a, button, input, select, textarea"
+  );
+  // Only scan as many elements as there are ids allocated to this iframe
+  const count = Math.min(elements.length, maxElements);
+  for (let i = 0; i < count; i++) {
+    const element = elements[i];
+    // checkVisibility also catches elements hidden by display: none ancestors,
+    // without forcing a computed style lookup per element
+    const visible = element.checkVisibility
+      ? element.checkVisibility({ checkVisibilityCSS: true })
+      : window.getComputedStyle(element).visibility !== "hidden";
+    if (!visible) {
+      continue;
+    }
+    const rect = element.getBoundingClientRect();
+    if (rect.width <= 0 || rect.height <= 0) {
+      continue;
+    }
+
+    const tagName = element.tagName.toLowerCase();
+    let simplified_html = "<" + tagName;
+    for (const attr of attrs) {
+      let attrValue = element.getAttribute(attr);
+      if (attrValue === null) {
+        continue;
+      }
+      // Represent boolean attributes consistently
+      if (attrValue === "" && booleanAttrs.includes(attr)) {
+        attrValue = "true";
+      }
+      // Avoid adding empty attributes unless meaningful (like value="")
+      if (attrValue !== "" || textyAttrs.includes(attr)) {
+        simplified_html += ` ${attr}="${truncate(attrValue)}"`;
+      }
+    }
+
+    // Get inner text, falling back to the first available text source for
+    // inputs
+    let innerText =
+      element.innerText ||
+      (tagName === "input"
+        ? truncate(
+            element.getAttribute("value") ||
+              element.getAttribute("placeholder") ||
+              element.getAttribute("aria-label") ||
+              element.getAttribute("title") ||
+              ""
+          )
+        : "");
+    innerText = innerText ? innerText.replace(/\s+/g, " ").trim() : "";
+    simplified_html += ">" + innerText + "</" + tagName + ">";
+
+    const index = startingIndex + i;
+    element.setAttribute("data-gwa-id", `gwa-element-${index}`);
+    results.push({
+      id: index,
+      html: simplified_html,
+      box: { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
+    });
+  }
+  return results;
+};
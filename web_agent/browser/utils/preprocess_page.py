@@ -5,18 +5,115 @@ Annotation actions for labeling and identifying interactive elements on web page
 import asyncio
 import base64
 import io
+import itertools
 import json
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw
-from playwright.async_api import Page
+from playwright.async_api import ElementHandle, Frame, Page
 
 from web_agent.browser.utils.dom_utils.load_js_file import load_js_file
 from web_agent.browser.utils.screenshot import take_element_screenshot, take_screenshot
 from web_agent.llm.client import LLMClient
 
+# Page scripts are loaded once at import rather than read from disk every step
+_FIND_INTERACTIVE_ELEMENTS_JS = load_js_file("find_interactive_elements.js")
+_DRAW_BOUNDING_BOXES_JS = load_js_file("draw_bounding_boxes.js")
+_SCAN_IFRAME_ELEMENTS_JS = load_js_file("scan_iframe_elements.js")
+
+# Screenshot filenames are the process start time plus a step counter, which
+# stays unique and sorted even when steps happen within the same second
+_RUN_ID = datetime.now().strftime("%Y%m%d_%H%M%S")
+_STEP_COUNTER = itertools.count()
+
+# Most element description calls in flight at once
+_ELEMENT_DESCRIPTION_CONCURRENCY = 20
+# Seconds to wait for all element descriptions before falling back to HTML
+_ELEMENT_DESCRIPTION_TIMEOUT = 60
+_CLEAR_BOUNDING_BOXES_JS = (
+    "() => { document.getElementById('gwa-overlay-root')?.remove(); }"
+)
+
+# Attributes kept when simplifying iframe elements' HTML
+_ATTRS_TO_CHECK = (
+    # Standard Attributes
+    "name",
+    "role",
+    "type",
+    "value",
+    "placeholder",
+    "title",
+    "alt",
+    "href",
+    # Boolean State Attributes
+    "checked",
+    "selected",
+    "disabled",
+    "readonly",
+    # ARIA Attributes
+    "aria-label",
+    "aria-checked",
+    "aria-selected",
+    "aria-expanded",
+    "aria-pressed",
+    "aria-disabled",
+    "aria-current",
+    "aria-haspopup",
+)
+_BOOLEAN_ATTRS = frozenset(
+    {
+        "checked",
+        "selected",
+        "disabled",
+        "readonly",
+        "aria-checked",
+        "aria-selected",
+        "aria-expanded",
+        "aria-pressed",
+        "aria-disabled",
+        "aria-current",
+    }
+)
+# Attributes that are kept even when empty
+_TEXTY_ATTRS = frozenset({"value", "alt", "placeholder", "title", "href"})
+
+# LLM prompt templates, filled in with str.format
+_ELEMENT_DESCRIPTION_PROMPT = """Task: Describe the function of the UI element in the screenshot.
+
+The first screenshot is the entire page with the element outlined with a red bounding box.
+
+The element has the following HTML:
+{simplified_html}
+
+
+Provide additional context about the element if necessary e.g. if there are multiple identical elements, say what the element is associated with.
+
+
+Output your response in JSON format:
+{{
+  "description": "string | a few words describing the element and its function. Include any disambiguating information if there are multiple elements that look similar.",
+}}
+"""
+
+_PAGE_OVERVIEW_PROMPT = """Tasks:
+1. Describe the main purpose of the page
+
+2. Provide a detailed overview of the key sections of the page. For each section, include a title, a brief description of the section, and important interactive elements (e.g. buttons, links, form fields, etc.). Order the sections from top to bottom as a numbered list.
+
+
+Page Title: {page_title}
+Page URL: {page_url}
+
+The screenshots are ordered from top to bottom; the first screenshot is the top of the page and the last screenshot is the bottom of the page.
+
+Output your response in JSON format.
+{{
+    "summary": <Answer to task 1>,
+    "detailed_breakdown": <Answer to task 2 in markdown format>,
+}}"""
+
 
 async def preprocess_page(
     page: Page, output_dir: str, llm_client: LLMClient
@@ -24,24 +121,22 @@ async def preprocess_page(
     """
     Preprocess the page and return the screenshot, bounding box screenshot, and element descriptions.
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = f"{_RUN_ID}_{next(_STEP_COUNTER):05d}"
 
     screenshot_base64 = await take_screenshot(
         page,
-        save_path=f"{output_dir}/screenshots/{timestamp}.png",
+        save_path=f"{output_dir}/screenshots/{timestamp}.jpg",
     )
     element_simplified_htmls = await find_interactive_elements(page)
-    await draw_bounding_boxes(page, list(element_simplified_htmls.keys()))
+    # Playwright only serializes real lists, so the ids are materialized once here
+    await draw_bounding_boxes(page, list(element_simplified_htmls))
     starting_index = len(element_simplified_htmls)
     # Find iframe elements and their interactive elements
     iframe_elements = await find_iframe_interactive_elements(page, starting_index)
 
-    # Merge iframe elements with main page elements
-    element_simplified_htmls.update(iframe_elements)
-
     bounding_box_screenshot_base64 = await take_screenshot(
         page,
-        save_path=f"{output_dir}/bounding_box_screenshots/{timestamp}.png",
+        save_path=f"{output_dir}/bounding_box_screenshots/{timestamp}.jpg",
     )
     await clear_bounding_boxes(page)
     # start_time = time.time()
@@ -53,12 +148,15 @@ async def preprocess_page(
     #     f"Time taken to get {len(elements)} element descriptions: {end_time - start_time} seconds"
     # )
 
+    # Merge iframe elements with main page elements
     elements = {
         element_id: {
-            "simplified_html": element_simplified_htmls[element_id],
-            # "description": element_simplified_htmls[element_id],
+            "simplified_html": simplified_html,
+            # "description": simplified_html,
         }
-        for element_id in element_simplified_htmls
+        for element_id, simplified_html in itertools.chain(
+            element_simplified_htmls.items(), iframe_elements.items()
+        )
     }
 
     return screenshot_base64, bounding_box_screenshot_base64, elements
@@ -69,215 +167,229 @@ async def find_iframe_interactive_elements(
 ) -> Dict[int, str]:
     """
     Find and identify interactive elements within iframes on the page.
+
+    Iframes are independent, so they are scanned concurrently. Each visible
+    iframe is first assigned a range of element ids sized by its number of
+    candidate elements, which keeps ids deterministic regardless of the order
+    the scans finish in.
     """
     iframe_locator = page.locator("iframe")
     iframe_elements = await iframe_locator.element_handles()
+
+    visible_iframes = [
+        iframe
+        for iframe in await asyncio.gather(
+            *[_find_visible_iframe(page, element) for element in iframe_elements]
+        )
+        if iframe
+    ]
+
+    # Pre-allocate an id range for each iframe
+    scans = []
+    next_index = starting_index
+    semaphore = asyncio.Semaphore(8)
+    for frame, bounding_box, candidate_count in visible_iframes:
+        scans.append(
+            _scan_iframe(
+                page, frame, bounding_box, next_index, candidate_count, semaphore
+            )
+        )
+        next_index += candidate_count
+
     iframes_element_simplified_htmls = {}
-    element_count = 0  # Track elements across all iframes
-
-    for element in iframe_elements:
-        # Check if the iframe is visible before processing its contents
-        try:
-            # Check 1: Playwright's built-in visibility
-            is_visible = await element.is_visible()
-            if not is_visible:
-                # Optional: Log why it's skipped
-                # print(f"Skipping non-visible iframe (is_visible=False): {await element.get_attribute('src')}")
-                continue
-
-            # Check 2: Bounding box check for zero size
-            bounding_box = await element.bounding_box()
-            if (
-                not bounding_box
-                or bounding_box["width"] <= 0
-                or bounding_box["height"] <= 0
-            ):
-                # Optional: Log why it's skipped
-                # print(f"Skipping iframe with zero-size bounding box: {await element.get_attribute('src')}")
-                continue
-
-            # Check 3: Coordinate check for being outside viewport
-            viewport_size = page.viewport_size
-            if not viewport_size:
-                # Fallback or skip if viewport size is unavailable
-                print(
-                    "Warning: Viewport size not available, skipping coordinate check for iframe."
-                )
-            elif (
-                bounding_box["x"] + bounding_box["width"] < 0  # Completely left
-                or bounding_box["y"] + bounding_box["height"] < 0  # Completely above
-                or bounding_box["x"] > viewport_size["width"]  # Completely right
-                or bounding_box["y"] > viewport_size["height"]  # Completely below
-            ):
-                # Optional: Log why it's skipped
-                # print(f"Skipping iframe outside of viewport: {await element.get_attribute('src')}")
-                continue
-
-            # Check 4: Explicit check for computed display/visibility styles
-            styles = await element.evaluate(
-                "el => JSON.stringify(window.getComputedStyle(el))"
+    overlays = []
+    for iframe_htmls, iframe_overlays in await asyncio.gather(*scans):
+        iframes_element_simplified_htmls.update(iframe_htmls)
+        overlays.extend(iframe_overlays)
+
+    # Draw the overlays for every iframe in a single call
+    if overlays:
+        await _draw_iframe_overlays(page, overlays)
+    return iframes_element_simplified_htmls
+
+
+async def _find_visible_iframe(
+    page: Page, element: ElementHandle
+) -> Optional[Tuple[Frame, Dict[str, float], int]]:
+    """
+    Check whether an iframe is visible and count its candidate elements.
+
+    Returns:
+        The iframe's frame, its bounding box and the number of candidate
+        interactive elements, or None if the iframe should be skipped
+    """
+    # Check if the iframe is visible before processing its contents. Size,
+    # display and visibility are checked in one evaluate, which also returns
+    # where the iframe's content box starts on the main page.
+    try:
+        bounding_box = await element.evaluate(
+            """el => {
+                const rect = el.getBoundingClientRect();
+                if (rect.width === 0 || rect.height === 0) return null;
+                const style = window.getComputedStyle(el);
+                const visible = el.checkVisibility
+                    ? el.checkVisibility({ checkVisibilityCSS: true })
+                    : style.display !== "none" && style.visibility !== "hidden";
+                if (!visible) return null;
+                return {
+                    x: rect.x,
+                    y: rect.y,
+                    width: rect.width,
+                    height: rect.height,
+                    contentX: rect.x + el.clientLeft + parseFloat(style.paddingLeft),
+                    contentY: rect.y + el.clientTop + parseFloat(style.paddingTop),
+                };
+            }"""
+        )
+        if not bounding_box:
+            return None
+
+        # Coordinate check for being outside viewport
+        viewport_size = page.viewport_size
+        if not viewport_size:
+            # Fallback or skip if viewport size is unavailable
+            print(
+                "Warning: Viewport size not available, skipping coordinate check for iframe."
             )
-            computed_style = json.loads(styles)
-            if (
-                computed_style.get("display") == "none"
-                or computed_style.get("visibility") == "hidden"
-            ):
-                # Optional: Log why it's skipped
-                # print(f"Skipping iframe with computed style hidden: {await element.get_attribute('src')}")
-                continue
-
-        except Exception as e:
-            print(f"Error checking iframe visibility: {e}")
-            continue
+        elif (
+            bounding_box["x"] + bounding_box["width"] < 0  # Completely left
+            or bounding_box["y"] + bounding_box["height"] < 0  # Completely above
+            or bounding_box["x"] > viewport_size["width"]  # Completely right
+            or bounding_box["y"] > viewport_size["height"]  # Completely below
+        ):
+            return None
 
         # Get the Frame object from the iframe element handle
         frame = await element.content_frame()
         if not frame:
-            continue
-
-        interactive_locator = frame.locator("a, button, input, select, textarea")
-        count = await interactive_locator.count()
-
-        for i in range(count):
-            elem = interactive_locator.nth(i)
-            if not await elem.is_visible():
-                continue
-
-            # --- Start HTML Simplification ---
-            tag_name = await elem.evaluate("el => el.tagName.toLowerCase()")
-            simplified_html = f"<{tag_name}"
-
-            attrs_to_check = [
-                # Standard Attributes
-                "name",
-                "role",
-                "type",
-                "value",
-                "placeholder",
-                "title",
-                "alt",
-                "href",
-                # Boolean State Attributes
-                "checked",
-                "selected",
-                "disabled",
-                "readonly",
-                # ARIA Attributes
-                "aria-label",
-                "aria-checked",
-                "aria-selected",
-                "aria-expanded",
-                "aria-pressed",
-                "aria-disabled",
-                "aria-current",
-                "aria-haspopup",
-            ]
-            boolean_attrs = [
-                "checked",
-                "selected",
-                "disabled",
-                "readonly",
-                "aria-checked",
-                "aria-selected",
-                "aria-expanded",
-                "aria-pressed",
-                "aria-disabled",
-                "aria-current",
+            return None
+
+        candidate_count = await frame.locator(
+            "a, button, input, select, textarea"
+        ).count()
+    except Exception as e:
+        print(f"Error checking iframe visibility: {e}")
+        return None
+
+    if not candidate_count:
+        return None
+    return frame, bounding_box, candidate_count
+
+
+async def _scan_iframe(
+    page: Page,
+    frame: Frame,
+    bounding_box: Dict[str, float],
+    starting_index: int,
+    max_elements: int,
+    semaphore: asyncio.Semaphore,
+) -> Tuple[Dict[int, str], List[List[float]]]:
+    """
+    Tag and simplify the visible interactive elements in an iframe and compute
+    their overlay boxes in main page coordinates.
+
+    Element ids are starting_index plus the element's position among the
+    iframe's candidate elements, and at most max_elements are scanned so the
+    ids stay within the range allocated to this iframe.
+    """
+    async with semaphore:
+        # Tag and simplify every visible element in a single evaluate
+        scanned_elements = await frame.evaluate(
+            _SCAN_IFRAME_ELEMENTS_JS,
+            {
+                "startingIndex": starting_index,
+                "maxElements": max_elements,
+                "attrs": list(_ATTRS_TO_CHECK),
+                "booleanAttrs": list(_BOOLEAN_ATTRS),
+                "textyAttrs": list(_TEXTY_ATTRS),
+            },
+        )
+
+    iframes_element_simplified_htmls = {}
+    overlays = []
+    for scanned in scanned_elements:
+        iframe_element_id = scanned["id"]
+        iframes_element_simplified_htmls[iframe_element_id] = scanned["html"]
+
+        box = scanned["box"]
+        overlays.append(
+            [
+                # Element boxes are relative to the iframe's viewport
+                bounding_box["contentX"] + box["x"],
+                bounding_box["contentY"] + box["y"],
+                box["width"],
+                box["height"],
+                iframe_element_id,
             ]
+        )
 
-            for attr in attrs_to_check:
-                attr_value = await elem.get_attribute(attr)
-                if attr_value is not None:
-                    # Represent boolean attributes consistently
-                    if attr in boolean_attrs and attr_value == "":
-                        attr_value = "true"
-
-                    # Avoid adding empty attributes unless meaningful (like value="")
-                    if attr_value != "" or attr in [
-                        "value",
-                        "alt",
-                        "placeholder",
-                        "title",
-                        "href",
-                    ]:
-                        # Truncate long attribute values
-                        if len(attr_value) > 50:
-                            attr_value = attr_value[:47] + "..."
-                        simplified_html += f' {attr}="{attr_value}"'
-
-            # Get inner text, trying common fallbacks for inputs
-            inner_text = await elem.inner_text()
-            if tag_name == "input" and not inner_text:
-                value = await elem.get_attribute("value")
-                placeholder = await elem.get_attribute("placeholder")
-                aria_label = await elem.get_attribute("aria-label")
-                title = await elem.get_attribute("title")
-                # Use the first available text source as a fallback
-                inner_text = value or placeholder or aria_label or title or ""
-
-            # Clean and add inner text
-            inner_text = " ".join(inner_text.split()) if inner_text else ""
-            # Note: JS version doesn't truncate inner text, only attributes.
-            simplified_html += f">{inner_text}</{tag_name}>"
-            # --- End HTML Simplification ---
-
-            # Add a unique identifier to track this iframe element
-            # Using starting_index + a unique counter for all iframe elements
-            iframe_element_id = starting_index + element_count
-            element_count += 1
-
-            await elem.evaluate(
-                f"el => el.setAttribute('data-gwa-id', 'gwa-element-{iframe_element_id}')"
-            )
-            # Use the simplified HTML
-            iframes_element_simplified_htmls[iframe_element_id] = simplified_html
-
-            box = await elem.bounding_box()
-            if not box:
-                continue
-            # Draw an overlay around the iframe element
-            await page.evaluate(
-                """([x, y, width, height, elementId]) => {
-                    // Create overlay with absolute positioning relative to the main document
-                    const overlay = document.createElement("div");
-                    overlay.className = "GWA-rect";
-                    overlay.style.position = "fixed";
-                    overlay.style.left = x + "px";
-                    overlay.style.top = y + "px";
-                    overlay.style.width = width + "px";
-                    overlay.style.height = height + "px";
-                    overlay.style.border = "2px solid brown";
-                    overlay.style.backgroundColor = "rgba(165, 42, 42, 0.1)";
-                    overlay.style.zIndex = "2147483647";
-                    overlay.style.pointerEvents = "none";
-
-                    // Add a label with the element ID
-                    const label = document.createElement("span");
-                    label.className = "GWA-label";
-                    label.textContent = elementId;
-                    label.style.position = "fixed";
-                    label.style.top = y + "px";
-                    label.style.left = x + "px";
-                    label.style.backgroundColor = "brown";
-                    label.style.color = "white";
-                    label.style.fontWeight = "bold";
-                    label.style.fontSize = "14px";
-                    label.style.padding = "1px";
-                    label.style.zIndex = "2147483647";
-                    
-                    // Append the overlay and label to the main document body
-                    document.body.appendChild(overlay);
-                    document.body.appendChild(label);
-                }""",
-                [
-                    box["x"],
-                    box["y"],
-                    box["width"],
-                    box["height"],
-                    iframe_element_id,
-                ],
-            )
-    return iframes_element_simplified_htmls
+    return iframes_element_simplified_htmls, overlays
+
+
+async def _draw_iframe_overlays(page: Page, overlays: List[List[float]]) -> None:
+    """
+    Draw bounding boxes for iframe elements on the main page in one call.
+
+    Args:
+        page: The Playwright page
+        overlays: [x, y, width, height, element_id] for each element, in main
+            page viewport coordinates
+    """
+    await page.evaluate(
+        """(overlays) => {
+            // Add to the overlay root created by draw_bounding_boxes.js,
+            // creating it if the main page had nothing to annotate
+            let host = document.getElementById("gwa-overlay-root");
+            if (!host) {
+                host = document.createElement("div");
+                host.id = "gwa-overlay-root";
+                host.style.position = "absolute";
+                host.style.top = "0px";
+                host.style.left = "0px";
+                host.style.width = "0px";
+                host.style.height = "0px";
+                host.style.zIndex = "2147483647";
+                host.style.pointerEvents = "none";
+                host.attachShadow({ mode: "open" });
+                document.body.appendChild(host);
+            }
+            // Build all overlays off-document and attach them in one append
+            const fragment = document.createDocumentFragment();
+            for (const [x, y, width, height, elementId] of overlays) {
+                // Create overlay with absolute positioning relative to the main document
+                const overlay = document.createElement("div");
+                overlay.className = "GWA-rect";
+                overlay.style.position = "fixed";
+                overlay.style.left = x + "px";
+                overlay.style.top = y + "px";
+                overlay.style.width = width + "px";
+                overlay.style.height = height + "px";
+                overlay.style.border = "2px solid brown";
+                overlay.style.backgroundColor = "rgba(165, 42, 42, 0.1)";
+                overlay.style.zIndex = "2147483647";
+                overlay.style.pointerEvents = "none";
+
+                // Add a label with the element ID
+                const label = document.createElement("span");
+                label.className = "GWA-label";
+                label.textContent = elementId;
+                label.style.position = "fixed";
+                label.style.top = y + "px";
+                label.style.left = x + "px";
+                label.style.backgroundColor = "brown";
+                label.style.color = "white";
+                label.style.fontWeight = "bold";
+                label.style.fontSize = "14px";
+                label.style.padding = "1px";
+                label.style.zIndex = "2147483647";
+
+                fragment.appendChild(overlay);
+                fragment.appendChild(label);
+            }
+            host.shadowRoot.appendChild(fragment);
+        }""",
+        overlays,
+    )
 
 
 async def find_interactive_elements(page: Page) -> Dict[int, str]:
@@ -291,10 +403,7 @@ async def find_interactive_elements(page: Page) -> Dict[int, str]:
     Returns:
         A dictionary mapping visible indices to simplified HTML representations
     """
-    # Load the JavaScript file
-    find_interactive_js = load_js_file("find_interactive_elements.js")
-
-    html_dict = await page.evaluate(find_interactive_js)
+    html_dict = await page.evaluate(_FIND_INTERACTIVE_ELEMENTS_JS)
 
     # Convert string keys to integers
     element_simplified_htmls = {int(k): v for k, v in html_dict.items()}
@@ -313,10 +422,7 @@ async def draw_bounding_boxes(page: Page, indices: List[int]) -> int:
     Returns:
         Number of elements that were annotated
     """
-    # Load the JavaScript file
-    draw_bounding_boxes_js = load_js_file("draw_bounding_boxes.js")
-
-    return await page.evaluate(draw_bounding_boxes_js, indices)
+    return await page.evaluate(_DRAW_BOUNDING_BOXES_JS, indices)
 
 
 async def clear_bounding_boxes(page: Page) -> None:
@@ -327,11 +433,7 @@ async def clear_bounding_boxes(page: Page) -> None:
     Args:
         page: The Playwright page
     """
-    await page.evaluate(
-        "() => { "
-        + "Array.from(document.querySelectorAll('.GWA-rect, .GWA-label')).forEach(el => el.remove());"
-        + " }"
-    )
+    await page.evaluate(_CLEAR_BOUNDING_BOXES_JS)
 
 
 async def get_element_descriptions(
@@ -344,78 +446,88 @@ async def get_element_descriptions(
         A dictionary mapping element IDs to their descriptions and simplified HTML
     """
 
+    # Decode the screenshot once; each element draws on its own copy
+    screenshot = Image.open(io.BytesIO(base64.b64decode(screenshot_base64))).convert(
+        "RGB"
+    )
+
+    # Get every tagged element's bounding box in a single round-trip
+    bounding_boxes = await page.evaluate(
+        """() => Object.fromEntries(
+            Array.from(document.querySelectorAll("[data-gwa-id]")).map((el) => {
+                const rect = el.getBoundingClientRect();
+                return [
+                    el.getAttribute("data-gwa-id"),
+                    { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
+                ];
+            })
+        )"""
+    )
+
     # Process all elements in parallel with a semaphore to limit concurrent calls
-    tasks = []
-    # Limit to 20 concurrent calls
-    semaphore = asyncio.Semaphore(20)
+    semaphore = asyncio.Semaphore(_ELEMENT_DESCRIPTION_CONCURRENCY)
 
-    async def get_element_description_with_semaphore(
-        page, element_id, simplified_html, screenshot_base64, output_dir, llm_client
-    ):
+    async def get_element_description_with_semaphore(element_id, simplified_html):
         async with semaphore:
-            return await get_element_description(
-                page,
+            description = await get_element_description(
                 element_id,
                 simplified_html,
-                screenshot_base64,
+                screenshot,
+                bounding_boxes.get(f"gwa-element-{element_id}"),
                 output_dir,
                 llm_client,
             )
+            return element_id, description
 
-    for element_id, simplified_html in element_simplified_htmls.items():
-        # Create the task with semaphore control
-        task = get_element_description_with_semaphore(
-            page,
-            element_id,
-            simplified_html,
-            screenshot_base64,
-            output_dir,
-            llm_client,
+    tasks = [
+        asyncio.create_task(
+            get_element_description_with_semaphore(element_id, simplified_html)
         )
-        tasks.append((element_id, task))
-
-    # Execute all tasks concurrently with semaphore limiting to 20 at a time
-    results = await asyncio.gather(*[task for _, task in tasks])
+        for element_id, simplified_html in element_simplified_htmls.items()
+    ]
 
-    # Map results to element IDs
-    elements = {}
-    for (element_id, _), result in zip(tasks, results):
-        elements[element_id] = {
-            "simplified_html": element_simplified_htmls[element_id],
-            "description": result,
+    # Elements whose description doesn't finish in time fall back to their HTML
+    elements = {
+        element_id: {
+            "simplified_html": simplified_html,
+            "description": simplified_html,
         }
+        for element_id, simplified_html in element_simplified_htmls.items()
+    }
+    try:
+        for next_result in asyncio.as_completed(
+            tasks, timeout=_ELEMENT_DESCRIPTION_TIMEOUT
+        ):
+            element_id, description = await next_result
+            elements[element_id]["description"] = description
+    except asyncio.TimeoutError:
+        print(
+            f"Timed out describing elements after {_ELEMENT_DESCRIPTION_TIMEOUT} seconds"
+        )
+    finally:
+        # Don't leave slow or orphaned description calls running
+        for task in tasks:
+            task.cancel()
 
     return elements
 
 
-async def get_element_description(
-    page: Page,
-    element_id: str,
-    simplified_html: str,
-    screenshot_base64: str,
-    output_dir: str,
-    llm_client: LLMClient,
-) -> str:
-    """
-    Get a description for a single element on the page.
+def _draw_element_highlight(
+    screenshot: Image.Image, bounding_box: Dict[str, float], buffer: int
+) -> bytes:
     """
+    Draw a red box around an element on a copy of the screenshot.
 
-    # Get the element bounding box coordinates
-    selector = f'[data-gwa-id="gwa-element-{element_id}"]'
-    element_handle = await page.query_selector(selector)
-    if not element_handle:
-        return "Element not found"
-
-    bounding_box = await element_handle.bounding_box()
-    if not bounding_box:
-        return "Element has no bounding box"
+    Args:
+        screenshot: The decoded page screenshot
+        bounding_box: The element's bounding box
+        buffer: Padding around the bounding box for better visibility
 
-    # Manually draw the bounding box on the screenshot using PIL
-    image_data = base64.b64decode(screenshot_base64)
-    image = Image.open(io.BytesIO(image_data))
+    Returns:
+        The highlighted screenshot encoded as JPEG
+    """
+    image = screenshot.copy()
     draw = ImageDraw.Draw(image)
-    # Add a small buffer around the bounding box for better visibility
-    buffer = 10
     draw.rectangle(
         [
             max(0, bounding_box["x"] - buffer),
@@ -426,27 +538,41 @@ async def get_element_description(
         outline="red",
         width=5,
     )
+    # JPEG is much cheaper to encode than PNG and smaller to upload
     buffered = io.BytesIO()
-    image.save(buffered, format="PNG")
-
-    page_screenshot_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
-
-    prompt = f"""Task: Describe the function of the UI element in the screenshot.
+    image.save(buffered, format="JPEG", quality=85)
+    return buffered.getvalue()
 
-The first screenshot is the entire page with the element outlined with a red bounding box.
 
-The element has the following HTML:
-{simplified_html}
+async def get_element_description(
+    element_id: str,
+    simplified_html: str,
+    screenshot: Image.Image,
+    bounding_box: Optional[Dict[str, float]],
+    output_dir: str,
+    llm_client: LLMClient,
+) -> str:
+    """
+    Get a description for a single element on the page.
 
+    The screenshot is the decoded page screenshot shared by all elements; it is
+    copied before the element's bounding box is drawn on it. The bounding box is
+    None if the element was not found on the page.
+    """
+    if not bounding_box:
+        return "Element not found"
 
-Provide additional context about the element if necessary e.g. if there are multiple identical elements, say what the element is associated with.
+    # Manually draw the bounding box on the screenshot using PIL. Descriptions
+    # run concurrently, so highlighting the element in the live page and taking
+    # a browser screenshot would need every capture serialized behind a lock.
+    # The drawing and encoding is CPU-bound, so it runs off the event loop.
+    image_bytes = await asyncio.to_thread(
+        _draw_element_highlight, screenshot, bounding_box, 10
+    )
 
+    page_screenshot_base64 = base64.b64encode(image_bytes).decode("utf-8")
 
-Output your response in JSON format:
-{{
-  "description": "string | a few words describing the element and its function. Include any disambiguating information if there are multiple elements that look similar.",
-}}
-"""
+    prompt = _ELEMENT_DESCRIPTION_PROMPT.format(simplified_html=simplified_html)
 
     user_message = llm_client.create_user_message_with_images(
         prompt, [page_screenshot_base64], "high"
@@ -478,22 +604,7 @@ async def get_page_overview(
 
     page_title = await page.title()
 
-    prompt = f"""Tasks:
-1. Describe the main purpose of the page
-
-2. Provide a detailed overview of the key sections of the page. For each section, include a title, a brief description of the section, and important interactive elements (e.g. buttons, links, form fields, etc.). Order the sections from top to bottom as a numbered list.
-
-
-Page Title: {page_title}
-Page URL: {page.url}
-
-The screenshots are ordered from top to bottom; the first screenshot is the top of the page and the last screenshot is the bottom of the page.
-
-Output your response in JSON format.
-{{
-    "summary": <Answer to task 1>,
-    "detailed_breakdown": <Answer to task 2 in markdown format>,
-}}"""
+    prompt = _PAGE_OVERVIEW_PROMPT.format(page_title=page_title, page_url=page.url)
 
     user_message = llm_client.create_user_message_with_images(
         prompt, full_page_screenshot_crops, "high"
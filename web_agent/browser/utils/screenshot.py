@@ -8,14 +8,34 @@ from typing import Optional
 
 from playwright.async_api import Page
 
+from web_agent.browser.utils.selectors import ELEMENT_SELECTOR
+
+# Screenshots are only consumed by vision models, so lossy JPEG is used unless
+# the caller explicitly saves to a .png path
+_JPEG_QUALITY = 85
+
+# Common browser limit on the height of a single capture
+_MAX_FULL_PAGE_HEIGHT = 16384
+
+
+def _screenshot_options(save_path: Optional[str]) -> dict:
+    """
+    Get the page.screenshot image options for the given save path.
+    """
+    if save_path and save_path.lower().endswith(".png"):
+        return {"type": "png"}
+    return {"type": "jpeg", "quality": _JPEG_QUALITY}
+
 
 async def take_screenshot_full_page(page: Page, save_path: Optional[str] = None) -> str:
     """
-    Take a screenshot of the full page by temporarily extending the viewport.
-    This avoids issues with fixed elements appearing multiple times.
+    Take a screenshot of the full page using Playwright's full page capture.
     """
-    # Get page dimensions
-    page_height = await page.evaluate("document.body.scrollHeight")
+    # Get page dimensions. The width is read from the page rather than
+    # page.viewport_size, which is None for contexts without a fixed viewport.
+    page_width, page_height = await page.evaluate(
+        "[document.documentElement.clientWidth, document.body.scrollHeight]"
+    )
 
     # Handle PDF pages (which often report height as 0)
     if page_height == 0:
@@ -26,68 +46,31 @@ async def take_screenshot_full_page(page: Page, save_path: Optional[str] = None)
         if is_pdf:
             print("PDF detected, using default PDF capture approach")
             # For PDFs, we'll use Playwright's built-in full_page option
-            screenshot = await page.screenshot(full_page=False)
             if save_path:
                 Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-                with open(save_path, "wb") as f:
-                    f.write(screenshot)
+            screenshot = await page.screenshot(
+                full_page=False, path=save_path, **_screenshot_options(save_path)
+            )
             return base64.b64encode(screenshot).decode("utf-8")
 
-    # Save original scroll position
-    original_position = await page.evaluate("window.scrollY")
-
-    # Scroll through the page to ensure all lazy-loaded content is loaded
-    # await page.evaluate("""
-    #     async () => {
-    #         // Save original scroll position
-    #         const originalPosition = window.scrollY;
-
-    #         // Scroll through the entire page
-    #         await new Promise((resolve) => {
-    #             let totalHeight = 0;
-    #             const distance = 100;
-    #             const timer = setInterval(() => {
-    #                 window.scrollBy(0, distance);
-    #                 totalHeight += distance;
-
-    #                 if(totalHeight >= document.body.scrollHeight){
-    #                     clearInterval(timer);
-    #                     resolve();
-    #                 }
-    #             }, 10);
-    #         });
-
-    #         // Restore original scroll position
-    #         window.scrollTo(0, originalPosition);
-    #     }
-    # """)
-
-    # Short delay to ensure everything is settled
-    await page.wait_for_timeout(500)
-
-    try:
-        # Resize viewport to fit the entire page
-        # Set a maximum height for the viewport to avoid issues with extremely long pages
-        # Most browsers have limits on viewport dimensions
-        max_viewport_height = 16384  # Common browser limit is around 16384 pixels
-        viewport_height = min(page_height, max_viewport_height)
-
-        await page.set_viewport_size({"width": 1200, "height": viewport_height})
-
-        # Take the screenshot in one go
-        screenshot = await page.screenshot(full_page=False)
-
-        if save_path:
-            Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, "wb") as f:
-                f.write(screenshot)
-
-        return base64.b64encode(screenshot).decode("utf-8")
+    # Playwright captures the whole document in one pass, so fixed elements are
+    # not repeated and the viewport and scroll position are left untouched.
+    # Extremely long pages are clipped to stay within browser image size limits.
+    clip = None
+    if page_height > _MAX_FULL_PAGE_HEIGHT:
+        clip = {
+            "x": 0,
+            "y": 0,
+            "width": page_width,
+            "height": _MAX_FULL_PAGE_HEIGHT,
+        }
+    if save_path:
+        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+    screenshot = await page.screenshot(
+        full_page=True, clip=clip, path=save_path, **_screenshot_options(save_path)
+    )
 
-    finally:
-        # Always restore original viewport size and scroll position
-        await page.set_viewport_size({"width": 1200, "height": 1600})
-        await page.evaluate(f"window.scrollTo(0, {original_position})")
+    return base64.b64encode(screenshot).decode("utf-8")
 
 
 async def take_screenshot(
@@ -113,7 +96,9 @@ async def take_screenshot(
 
     if save_path:
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-    screenshot = await page.screenshot(full_page=False, path=save_path)
+    screenshot = await page.screenshot(
+        full_page=False, path=save_path, **_screenshot_options(save_path)
+    )
     return base64.b64encode(screenshot).decode("utf-8")
 
 
@@ -131,7 +116,7 @@ async def take_element_screenshot(
     Returns:
         Base64-encoded string of the screenshot, or None if element not found
     """
-    selector = f'[data-gwa-id="gwa-element-{element_id}"]'
+    selector = ELEMENT_SELECTOR.format(element_id)
 
     # First try to find the element in the main frame
     element = await page.query_selector(selector)
@@ -139,7 +124,9 @@ async def take_element_screenshot(
     if element:
         if save_path:
             Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        screenshot = await element.screenshot(path=save_path)
+        screenshot = await element.screenshot(
+            path=save_path, **_screenshot_options(save_path)
+        )
         return base64.b64encode(screenshot).decode("utf-8")
 
     # If not found in main frame, look for it in all frames
@@ -148,7 +135,9 @@ async def take_element_screenshot(
         if element:
             if save_path:
                 Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-            screenshot = await element.screenshot(path=save_path)
+            screenshot = await element.screenshot(
+                path=save_path, **_screenshot_options(save_path)
+            )
             return base64.b64encode(screenshot).decode("utf-8")
 
     # If we get here, element wasn't found in any frame
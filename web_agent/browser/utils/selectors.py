@@ -0,0 +1,7 @@
+"""
+Selectors for elements tagged by the page preprocessing scripts.
+"""
+
+# find_interactive_elements.js and the iframe scan tag each interactive element
+# with data-gwa-id="gwa-element-<id>"; format with the element id to select it
+ELEMENT_SELECTOR = '[data-gwa-id="gwa-element-{}"]'
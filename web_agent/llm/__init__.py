@@ -1,3 +1,5 @@
+from .batch import BatchSpool
+from .cache import DEFAULT_DISK_CACHE_PATH, LLMDiskCache
 from .client import LLMClient
 
-__all__ = ["LLMClient"]
+__all__ = ["BatchSpool", "DEFAULT_DISK_CACHE_PATH", "LLMClient", "LLMDiskCache"]
@@ -0,0 +1,91 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Polling starts at 30 seconds and backs off to at most 5 minutes
+INITIAL_POLL_INTERVAL = 30
+MAX_POLL_INTERVAL = 300
+
+FINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchSpool:
+    """Collects chat completion requests and runs them through the OpenAI Batch API
+
+    Batches cost half as much as regular calls and use a separate rate limit
+    pool, but can take up to 24 hours to complete.
+    """
+
+    def __init__(self, client: AsyncOpenAI, spool_path: Optional[str] = None):
+        self.client = client
+        # If given, the JSONL request file is also kept on disk for inspection
+        self.spool_path = Path(spool_path) if spool_path else None
+        self._lines: List[bytes] = []
+
+    def add(self, custom_id: str, body: Dict[str, Any]) -> None:
+        """Add a request to the spool
+
+        Args:
+            custom_id: Unique ID for matching the request to its response
+            body: The chat completions request body
+        """
+        self._lines.append(
+            orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": body,
+                },
+                # Assistant messages in the history are ChatCompletionMessage objects
+                default=lambda o: o.model_dump(exclude_none=True),
+            )
+        )
+
+    async def flush(self) -> Dict[str, ChatCompletion]:
+        """Submit the spooled requests as a batch and wait for it to finish
+
+        Returns:
+            The response to each request, keyed by its custom ID
+        """
+        data = b"\n".join(self._lines)
+        self._lines = []
+        if self.spool_path:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(self.spool_path.write_bytes, data)
+
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", data), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+
+        poll_interval = INITIAL_POLL_INTERVAL
+        while batch.status not in FINAL_BATCH_STATUSES:
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise Exception(f"Batch {batch.id} did not complete: {batch.status}")
+
+        output = await self.client.files.content(batch.output_file_id)
+        responses = {}
+        for line in output.content.splitlines():
+            result = orjson.loads(line)
+            response = result.get("response")
+            if result.get("error") or not response or response["status_code"] != 200:
+                continue
+            responses[result["custom_id"]] = ChatCompletion.model_validate(
+                response["body"]
+            )
+        return responses
@@ -0,0 +1,61 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from openai.types.chat import ChatCompletionMessage
+
+DEFAULT_DISK_CACHE_PATH = "~/.cache/wayfinder/llm.sqlite"
+
+
+class LLMDiskCache:
+    """SQLite-backed store of LLM responses that persists across runs"""
+
+    def __init__(self, path: str = DEFAULT_DISK_CACHE_PATH):
+        db_path = Path(path).expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Queries run in worker threads, so the connection is shared between
+        # threads and guarded by a lock
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, created_at INTEGER NOT NULL"
+                ")"
+            )
+            self._connection.commit()
+
+    async def get(self, key: str) -> Optional[ChatCompletionMessage]:
+        """Get the cached response for a request key, if there is one"""
+        payload = await asyncio.to_thread(self._read, key)
+        if payload is None:
+            return None
+        return ChatCompletionMessage.model_validate_json(payload)
+
+    async def set(self, key: str, message: ChatCompletionMessage) -> None:
+        """Store the response for a request key"""
+        await asyncio.to_thread(self._write, key, message.model_dump_json().encode())
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _read(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, key: str, payload: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, payload, created_at) VALUES (?, ?, ?)",
+                (key, payload, int(time.time())),
+            )
+            self._connection.commit()
@@ -1,7 +1,38 @@
-from typing import Any, Dict, List, Literal, Optional, Union
+import asyncio
+import base64
+import functools
+import hashlib
+import io
+import os
+import random
+from collections import OrderedDict, defaultdict
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from openai import AsyncAzureOpenAI, AsyncOpenAI
-from openai.types.chat import ChatCompletionMessage
+import httpx
+import orjson
+from openai import (
+    AsyncAzureOpenAI,
+    AsyncOpenAI,
+    AuthenticationError,
+    BadRequestError,
+    DefaultAsyncHttpxClient,
+    NotFoundError,
+    PermissionDeniedError,
+    RateLimitError,
+    pydantic_function_tool,
+)
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 from openai.types.chat.chat_completion_content_part_image_param import (
     ChatCompletionContentPartImageParam,
     ImageURL,
@@ -10,9 +41,17 @@ from openai.types.chat.chat_completion_content_part_text_param import (
     ChatCompletionContentPartTextParam,
 )
 from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
+from openai.types.chat.chat_completion_message_tool_call import Function
 from openai.types.chat.chat_completion_user_message_param import (
     ChatCompletionUserMessageParam,
 )
+from PIL import Image
+from pydantic import BaseModel
+
+from web_agent.llm.batch import BatchSpool
+from web_agent.llm.cache import LLMDiskCache
+
+StructuredOutputT = TypeVar("StructuredOutputT", bound=BaseModel)
 
 PRICING = {
     "gpt-4o-mini": {
@@ -45,89 +84,667 @@ PRICING = {
     },
 }
 
+# (prompt, completion) rate per token for each model, for one lookup per model
+PRICING_RATES = {
+    model: (rates["prompt_tokens"], rates["completion_tokens"])
+    for model, rates in PRICING.items()
+}
+
+
+# Batch API usage is tracked under the model name with this suffix
+BATCH_MODEL_SUFFIX = " (batch)"
+BATCH_DISCOUNT = 0.5
+
+
+def get_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Get the cost of a model's token usage"""
+    if model.endswith(BATCH_MODEL_SUFFIX):
+        base_model = model.removesuffix(BATCH_MODEL_SUFFIX)
+        return BATCH_DISCOUNT * get_cost(base_model, prompt_tokens, completion_tokens)
+    prompt_rate, completion_rate = PRICING_RATES[model]
+    return prompt_tokens * prompt_rate + completion_tokens * completion_rate
+
+
+# Leading base64 characters of each image format's magic bytes
+IMAGE_MIME_TYPES = {
+    "/9j/": "image/jpeg",
+    "UklGR": "image/webp",
+}
+
+# Max edge in pixels and WebP quality for each reduced image quality
+IMAGE_QUALITY_SETTINGS = {
+    "medium": (1024, 75),
+    "low": (512, 60),
+}
+
+
+def get_image_mime_type(image_base64: str) -> str:
+    """Get the MIME type of a base64-encoded image, defaulting to PNG"""
+    for prefix, mime_type in IMAGE_MIME_TYPES.items():
+        if image_base64.startswith(prefix):
+            return mime_type
+    return "image/png"
+
+
+def downsample_image(image_base64: str, max_size: int, quality: int) -> str:
+    """Downscale a base64-encoded image to fit max_size and re-encode it as WebP
+
+    This is CPU-bound, so async callers should run it with asyncio.to_thread.
+    """
+    image = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+    image.thumbnail((max_size, max_size), Image.LANCZOS)
+    buffered = io.BytesIO()
+    image.save(buffered, format="WEBP", quality=quality)
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
+# Number of image data URLs kept for reuse across messages
+IMAGE_DATA_URL_CACHE_SIZE = 64
+
+# Number of responses kept in each client's in-memory response cache
+RESPONSE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=IMAGE_DATA_URL_CACHE_SIZE)
+def get_image_digest(url: str) -> str:
+    """Get a stable digest of an image URL for request keys
+
+    Data URLs are reused across messages, so an image sent in several calls is
+    only hashed once.
+    """
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def get_cache_key(
+    messages: List[ChatCompletionMessageParam],
+    model: str,
+    tools: Optional[List[Dict[str, Any]]],
+    json_format: bool,
+    reasoning_effort: Optional[str],
+) -> str:
+    """Get a deterministic key identifying the request for an LLM call"""
+    # Images are keyed by their digest so the base64 payloads aren't serialized
+    keyed_messages = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, list):
+            message = {
+                **message,
+                "content": [
+                    {
+                        **content_item,
+                        "image_url": {
+                            **content_item["image_url"],
+                            "url": get_image_digest(content_item["image_url"]["url"]),
+                        },
+                    }
+                    if content_item.get("type") == "image_url"
+                    else content_item
+                    for content_item in content
+                ],
+            }
+        keyed_messages.append(message)
+
+    request = orjson.dumps(
+        {
+            "model": model,
+            "messages": keyed_messages,
+            "tools": tools,
+            "json_format": json_format,
+            "reasoning_effort": reasoning_effort,
+        },
+        # Assistant messages in the history are ChatCompletionMessage objects
+        default=lambda o: o.model_dump() if hasattr(o, "model_dump") else str(o),
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(request).hexdigest()
+
+
+def get_request_kwargs(
+    model: str,
+    tools: Optional[List[Dict[str, Any]]],
+    json_format: bool,
+    reasoning_effort: Optional[str],
+    n: int = 1,
+) -> Dict[str, Any]:
+    """Get the chat completions parameters for a call, other than the messages"""
+    kwargs = {}
+    if json_format and not tools:
+        kwargs["response_format"] = {"type": "json_object"}
+    if n > 1:
+        # Sample at the default temperature so the generations differ
+        kwargs["n"] = n
+    elif model.startswith("gpt"):
+        kwargs["temperature"] = 0.0
+    if model.startswith("o"):
+        kwargs["reasoning_effort"] = reasoning_effort
+    if tools:
+        kwargs["tools"] = tools
+        kwargs["tool_choice"] = "required"
+        if model.startswith("gpt"):
+            kwargs["parallel_tool_calls"] = False
+    return kwargs
+
+
+class InFlightCallCancelled(Exception):
+    """Raised to callers waiting on an identical call whose caller was cancelled"""
+
+
+# Errors from invalid requests, which fail the same way on every attempt
+PERMANENT_ERRORS = (
+    BadRequestError,
+    AuthenticationError,
+    PermissionDeniedError,
+    NotFoundError,
+)
+
+# Upper bound in seconds on the backoff between retries
+MAX_RETRY_DELAY = 30
+
+
+def get_retry_delay(error: Exception, attempt: int) -> float:
+    """Get how long to wait before retrying a failed call
+
+    Rate limit errors use the server's Retry-After header when present. Other
+    errors back off exponentially with jitter so concurrent retries spread out.
+    """
+    if isinstance(error, RateLimitError):
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_DELAY)
+            except ValueError:
+                pass
+    return min(2**attempt + random.random(), MAX_RETRY_DELAY)
+
+
+def is_cacheable(
+    model: str,
+    tools: Optional[List[Dict[str, Any]]],
+    reasoning_effort: Optional[str],
+) -> bool:
+    """Whether the response to a call can be reused for an identical request
+
+    Tool calls choose the agent's next action and reasoning models sample their
+    reasoning, so neither is treated as deterministic.
+    """
+    if tools:
+        return False
+    if model.startswith("o") and reasoning_effort != "low":
+        return False
+    return True
+
+
+@functools.cache
+def _http_client() -> httpx.AsyncClient:
+    """Get the HTTP/2 connection pool shared by the SDK clients
+
+    Concurrent calls are multiplexed over kept-alive connections instead of
+    each opening a new TLS session.
+    """
+    return DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=32,
+            keepalive_expiry=60,
+        ),
+    )
+
+
+@functools.cache
+def _azure_client() -> AsyncAzureOpenAI:
+    """Get the Azure OpenAI client shared by every LLMClient"""
+    return AsyncAzureOpenAI(
+        api_version="2025-01-01-preview",
+        azure_endpoint="https://jonathan-research.openai.azure.com",
+        http_client=_http_client(),
+    )
+
+
+@functools.cache
+def _oai_client() -> AsyncOpenAI:
+    """Get the OpenAI client shared by every LLMClient"""
+    return AsyncOpenAI(http_client=_http_client())
+
+
+# Token usage is stored per model as [prompt_tokens, completion_tokens, total_tokens]
+TOKEN_USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
 
 class LLMClient:
-    global_token_usage = {}
+    global_token_usage: DefaultDict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
 
-    def __init__(self):
-        self.client = AsyncAzureOpenAI(
-            api_version="2025-01-01-preview",
-            azure_endpoint="https://jonathan-research.openai.azure.com",
-        )
-        self.oai_client = AsyncOpenAI()
+    def __init__(self, disk_cache_path: Optional[str] = None):
+        # The SDK clients are shared by every LLMClient in the process
+        self.client = _azure_client()
+        self.oai_client = _oai_client()
         self.max_retries = 3
-        self.token_usage = {}
+        self.token_usage: DefaultDict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+        self.response_cache: OrderedDict[str, ChatCompletionMessage] = OrderedDict()
+        self.cache_hits = 0
+        # Calls being made, keyed by cache key, for identical calls to wait on
+        self.in_flight_calls: Dict[str, asyncio.Future] = {}
+        # Base64-encoded image -> data URL, for the most recently used images
+        self.image_data_urls: OrderedDict[str, str] = OrderedDict()
+        # Responses are also persisted across runs when a disk cache is given
+        self.disk_cache = LLMDiskCache(disk_cache_path) if disk_cache_path else None
+        # Bounds the calls make_calls has in flight at once
+        self.batch_semaphore = asyncio.Semaphore(
+            int(os.environ.get("WAYFINDER_LLM_CONCURRENCY", "5"))
+        )
 
     async def make_call(
         self,
         messages: List[ChatCompletionMessageParam],
         model: str,
         tools: Optional[List[Dict[str, Any]]] = None,
-        attempt: int = 0,
         timeout: int = 120,
         json_format: bool = True,
         reasoning_effort: Optional[Literal["low", "medium", "high"]] = "high",
     ) -> ChatCompletionMessage:
-        """Helper method to make LLM API calls with retry logic"""
+        """Helper method to make LLM API calls with caching and retry logic"""
+        if not is_cacheable(model, tools, reasoning_effort):
+            (message,) = await self._call_api(
+                messages, model, tools, timeout, json_format, reasoning_effort
+            )
+            return message
+
+        cache_key = get_cache_key(messages, model, tools, json_format, reasoning_effort)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            # Cache hits cost nothing, so they aren't added to token usage
+            self.response_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            return cached_response
+
+        # Share the result of an identical call that is already in flight
+        in_flight_call = self.in_flight_calls.get(cache_key)
+        if in_flight_call is not None:
+            try:
+                message = await asyncio.shield(in_flight_call)
+            except InFlightCallCancelled:
+                # The caller making the call was cancelled, so this waiter
+                # makes the call again rather than inheriting the cancellation
+                return await self.make_call(
+                    messages,
+                    model,
+                    tools,
+                    timeout,
+                    json_format,
+                    reasoning_effort,
+                )
+            self.cache_hits += 1
+            return message
+
+        in_flight_call = asyncio.get_running_loop().create_future()
+        # Mark errors as retrieved in case no identical call ends up waiting
+        in_flight_call.add_done_callback(
+            lambda future: future.cancelled() or future.exception()
+        )
+        self.in_flight_calls[cache_key] = in_flight_call
+        try:
+            message = await self._make_uncached_call(
+                cache_key,
+                messages,
+                model,
+                tools,
+                timeout,
+                json_format,
+                reasoning_effort,
+            )
+            in_flight_call.set_result(message)
+            return message
+        except Exception as e:
+            in_flight_call.set_exception(e)
+            raise
+        finally:
+            del self.in_flight_calls[cache_key]
+            if not in_flight_call.done():
+                in_flight_call.set_exception(InFlightCallCancelled())
+
+    async def _make_uncached_call(
+        self,
+        cache_key: str,
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]],
+        timeout: int,
+        json_format: bool,
+        reasoning_effort: Optional[Literal["low", "medium", "high"]],
+    ) -> ChatCompletionMessage:
+        """Get a response that isn't in the in-memory cache and cache it"""
+        if self.disk_cache:
+            cached_response = await self.disk_cache.get(cache_key)
+            if cached_response is not None:
+                self._cache_response(cache_key, cached_response)
+                self.cache_hits += 1
+                return cached_response
+
+        (message,) = await self._call_api(
+            messages, model, tools, timeout, json_format, reasoning_effort
+        )
+
+        self._cache_response(cache_key, message)
+        if self.disk_cache:
+            await self.disk_cache.set(cache_key, message)
+
+        return message
+
+    async def make_structured_call(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        schema: Type[StructuredOutputT],
+        timeout: int = 120,
+        reasoning_effort: Optional[Literal["low", "medium", "high"]] = "high",
+    ) -> StructuredOutputT:
+        """Make an LLM call whose response is parsed into a pydantic model
+
+        The schema is given to the model as a single strict function tool, so
+        decoding is constrained to the schema rather than to JSON in general.
+
+        Returns:
+            The response validated against the schema
+        """
+        message = await self.make_call(
+            messages,
+            model,
+            tools=[pydantic_function_tool(schema)],
+            timeout=timeout,
+            json_format=False,
+            reasoning_effort=reasoning_effort,
+        )
+        if not message.tool_calls:
+            raise ValueError(f"No structured output received. Model: {model}")
+        return schema.model_validate(
+            orjson.loads(message.tool_calls[0].function.arguments)
+        )
+
+    async def make_calls(
+        self, calls: List[Dict[str, Any]]
+    ) -> List[ChatCompletionMessage]:
+        """Make independent LLM calls concurrently
+
+        Args:
+            calls: The keyword arguments for make_call for each call
+
+        Returns:
+            The response to each call, in the same order as calls
+        """
+
+        async def make_call_with_semaphore(call: Dict[str, Any]):
+            async with self.batch_semaphore:
+                return await self.make_call(**call)
+
+        return await asyncio.gather(*(make_call_with_semaphore(call) for call in calls))
+
+    async def make_call_multi(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        n: int,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        timeout: int = 120,
+        json_format: bool = True,
+        reasoning_effort: Optional[Literal["low", "medium", "high"]] = "high",
+    ) -> List[ChatCompletionMessage]:
+        """Generate several candidate responses to the same messages in one call
+
+        The prompt is sent and billed once and counts as a single request
+        against rate limits. Candidates aren't cached since they are sampled.
+
+        Returns:
+            The n candidate responses
+        """
+        return await self._call_api(
+            messages, model, tools, timeout, json_format, reasoning_effort, n
+        )
+
+    async def make_streaming_call(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        on_delta: Optional[Callable[[str], None]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        timeout: int = 120,
+        json_format: bool = True,
+        reasoning_effort: Optional[Literal["low", "medium", "high"]] = "high",
+    ) -> ChatCompletionMessage:
+        """Make an LLM call whose response is streamed as it's generated
+
+        This lets callers start processing the head of a long response, e.g.
+        with an incremental JSON parser, while the rest is still decoding.
+        Streamed responses aren't cached.
+
+        Args:
+            on_delta: Called with each piece of content or tool call arguments
+                as it arrives
+
+        Returns:
+            The complete response
+        """
         if model == "o4-mini":
             client = self.oai_client
         else:
             client = self.client
-        try:
-            kwargs = {}
-            if json_format and not tools:
-                kwargs["response_format"] = {"type": "json_object"}
-            if model.startswith("gpt"):
-                kwargs["temperature"] = 0.0
-            if model.startswith("o"):
-                kwargs["reasoning_effort"] = reasoning_effort
-            if tools:
-                kwargs["tools"] = tools
-                kwargs["tool_choice"] = "required"
-                if model.startswith("gpt"):
-                    kwargs["parallel_tool_calls"] = False
-
-            response = await client.with_options(
-                timeout=timeout
-            ).chat.completions.create(model=model, messages=messages, **kwargs)
-
-            # Track token usage by model
-            if model not in self.token_usage:
-                self.token_usage[model] = {
-                    "prompt_tokens": 0,
-                    "completion_tokens": 0,
-                    "total_tokens": 0,
-                }
-
-            if model not in LLMClient.global_token_usage:
-                LLMClient.global_token_usage[model] = {
-                    "prompt_tokens": 0,
-                    "completion_tokens": 0,
-                    "total_tokens": 0,
-                }
-
-            # Update token counts
-            usage = response.usage
-            self.token_usage[model]["prompt_tokens"] += usage.prompt_tokens
-            self.token_usage[model]["completion_tokens"] += usage.completion_tokens
-            self.token_usage[model]["total_tokens"] += usage.total_tokens
-
-            LLMClient.global_token_usage[model]["prompt_tokens"] += usage.prompt_tokens
-            LLMClient.global_token_usage[model]["completion_tokens"] += (
-                usage.completion_tokens
+        kwargs = get_request_kwargs(model, tools, json_format, reasoning_effort)
+
+        # Only opening the stream is retried, since deltas may already have been
+        # passed to on_delta once it has started
+        for attempt in range(self.max_retries):
+            try:
+                stream = await client.with_options(
+                    timeout=timeout
+                ).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **kwargs,
+                )
+                break
+            except PERMANENT_ERRORS:
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries - 1:
+                    raise Exception(
+                        f"Failed after {self.max_retries} attempts: {str(e)}"
+                    )
+                print(
+                    f"Attempt {attempt + 1} failed with error: {str(e)}. Model: {model}, Timeout: {timeout}"
+                )
+                await asyncio.sleep(get_retry_delay(e, attempt))
+
+        content = io.StringIO()
+        # Tool call index -> [id, function name, arguments buffer]
+        tool_calls: Dict[int, List[Any]] = {}
+        usage = None
+        async for chunk in stream:
+            # The final chunk has the usage and no choices
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.write(delta.content)
+                if on_delta:
+                    on_delta(delta.content)
+            for tool_call_delta in delta.tool_calls or []:
+                tool_call = tool_calls.setdefault(
+                    tool_call_delta.index, [None, "", io.StringIO()]
+                )
+                if tool_call_delta.id:
+                    tool_call[0] = tool_call_delta.id
+                function = tool_call_delta.function
+                if function and function.name:
+                    tool_call[1] += function.name
+                if function and function.arguments:
+                    tool_call[2].write(function.arguments)
+                    if on_delta:
+                        on_delta(function.arguments)
+
+        if usage:
+            self._track_token_usage(
+                model, usage.prompt_tokens, usage.completion_tokens, usage.total_tokens
             )
-            LLMClient.global_token_usage[model]["total_tokens"] += usage.total_tokens
 
-            return response.choices[0].message
-        except Exception as e:
-            if attempt >= self.max_retries - 1:
-                raise Exception(f"Failed after {self.max_retries} attempts: {str(e)}")
-            print(
-                f"Attempt {attempt + 1} failed with error: {str(e)}. Model: {model}, Timeout: {timeout}"
+        # The message is echoed back in later requests, which reject tool calls
+        # without an ID or function name
+        for index, (tool_call_id, name, _) in tool_calls.items():
+            if not tool_call_id or not name:
+                raise ValueError(
+                    f"Streamed tool call {index} is missing its ID or function name. Model: {model}"
+                )
+
+        return ChatCompletionMessage(
+            role="assistant",
+            content=content.getvalue() or None,
+            tool_calls=[
+                ChatCompletionMessageToolCall(
+                    id=tool_call_id,
+                    type="function",
+                    function=Function(name=name, arguments=arguments.getvalue()),
+                )
+                for _, (tool_call_id, name, arguments) in sorted(tool_calls.items())
+            ]
+            or None,
+        )
+
+    async def make_deferred_calls(
+        self, calls: List[Dict[str, Any]], spool_path: Optional[str] = None
+    ) -> List[ChatCompletionMessage]:
+        """Make LLM calls through the Batch API at half the cost
+
+        Only use this for work that can wait, e.g. offline evaluation, since a
+        batch can take up to 24 hours to complete.
+
+        Args:
+            calls: The messages, model and optionally tools, json_format and
+                reasoning_effort for each call
+            spool_path: Path to also save the JSONL batch request file to
+
+        Returns:
+            The response to each call, in the same order as calls
+        """
+        spool = BatchSpool(self.oai_client, spool_path)
+        for i, call in enumerate(calls):
+            spool.add(
+                f"request-{i}",
+                {
+                    "model": call["model"],
+                    "messages": call["messages"],
+                    **get_request_kwargs(
+                        call["model"],
+                        call.get("tools"),
+                        call.get("json_format", True),
+                        call.get("reasoning_effort", "high"),
+                    ),
+                },
             )
-            return await self.make_call(
-                messages, model, tools, attempt + 1, timeout, json_format
+        responses = await spool.flush()
+
+        messages = []
+        for i, call in enumerate(calls):
+            response = responses.get(f"request-{i}")
+            if response is None:
+                raise Exception(f"Batch request {i} failed. Model: {call['model']}")
+            usage = response.usage
+            self._track_token_usage(
+                f"{call['model']}{BATCH_MODEL_SUFFIX}",
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                usage.total_tokens,
             )
+            messages.append(response.choices[0].message)
+        return messages
+
+    async def _call_api(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        tools: Optional[List[Dict[str, Any]]],
+        timeout: int,
+        json_format: bool,
+        reasoning_effort: Optional[Literal["low", "medium", "high"]],
+        n: int = 1,
+    ) -> List[ChatCompletionMessage]:
+        """Call the chat completions API, retrying transient failures with backoff
+
+        Returns:
+            The n generated messages
+        """
+        if model == "o4-mini":
+            client = self.oai_client
+        else:
+            client = self.client
+        kwargs = get_request_kwargs(model, tools, json_format, reasoning_effort, n)
+
+        for attempt in range(self.max_retries):
+            try:
+                response = await client.with_options(
+                    timeout=timeout
+                ).chat.completions.create(model=model, messages=messages, **kwargs)
+                break
+            except PERMANENT_ERRORS:
+                # The request itself is invalid, so retrying would fail the same way
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries - 1:
+                    raise Exception(
+                        f"Failed after {self.max_retries} attempts: {str(e)}"
+                    )
+                print(
+                    f"Attempt {attempt + 1} failed with error: {str(e)}. Model: {model}, Timeout: {timeout}"
+                )
+                await asyncio.sleep(get_retry_delay(e, attempt))
+
+        usage = response.usage
+        self._track_token_usage(
+            model, usage.prompt_tokens, usage.completion_tokens, usage.total_tokens
+        )
+
+        return [choice.message for choice in response.choices]
+
+    def _track_token_usage(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        total_tokens: int,
+    ) -> None:
+        """Add a call's token counts to this client's and the global usage"""
+        # Usage is async-only, so updates within one event loop can't interleave
+        for usage in (self.token_usage[model], LLMClient.global_token_usage[model]):
+            usage[0] += prompt_tokens
+            usage[1] += completion_tokens
+            usage[2] += total_tokens
+
+    async def aclose(self) -> None:
+        """Close the client's disk cache
+
+        The shared HTTP connections stay open for other clients; use aclose_all()
+        """
+        if self.disk_cache:
+            self.disk_cache.close()
+
+    @classmethod
+    async def aclose_all(cls) -> None:
+        """Close the shared SDK clients and their connections. Call once at process exit."""
+        await _azure_client().close()
+        await _oai_client().close()
+        await _http_client().aclose()
+        # Clients made after this get new connections
+        _azure_client.cache_clear()
+        _oai_client.cache_clear()
+        _http_client.cache_clear()
+
+    def _cache_response(self, cache_key: str, message: ChatCompletionMessage) -> None:
+        """Add a response to the in-memory cache, evicting the oldest if full"""
+        self.response_cache[cache_key] = message
+        if len(self.response_cache) > RESPONSE_CACHE_SIZE:
+            self.response_cache.popitem(last=False)
 
     def get_token_usage(self) -> Dict[str, Dict[str, int]]:
         """Get the current token usage statistics for all models
@@ -135,14 +752,16 @@ class LLMClient:
         Returns:
             A dictionary with token usage statistics by model
         """
-        return self.token_usage
+        return {
+            model: dict(zip(TOKEN_USAGE_FIELDS, usage))
+            for model, usage in self.token_usage.items()
+        }
 
     def get_total_cost(self) -> float:
         """Get the total cost of all token usage"""
         return sum(
-            usage["prompt_tokens"] * PRICING[model]["prompt_tokens"]
-            + usage["completion_tokens"] * PRICING[model]["completion_tokens"]
-            for model, usage in self.token_usage.items()
+            get_cost(model, prompt_tokens, completion_tokens)
+            for model, (prompt_tokens, completion_tokens, _) in self.token_usage.items()
         )
 
     def print_token_usage(self, global_usage: bool = False) -> None:
@@ -154,20 +773,22 @@ class LLMClient:
         else:
             token_usage = self.token_usage
 
-        for model, usage in token_usage.items():
+        total_cost = 0.0
+        for model, (
+            prompt_tokens,
+            completion_tokens,
+            total_tokens,
+        ) in token_usage.items():
+            cost = get_cost(model, prompt_tokens, completion_tokens)
+            total_cost += cost
             print(f"Model: {model}")
-            print(f"  Prompt tokens: {usage['prompt_tokens']}")
-            print(f"  Completion tokens: {usage['completion_tokens']}")
-            print(f"  Total tokens: {usage['total_tokens']}")
-            print(
-                f"  Cost: ${usage['prompt_tokens'] * PRICING[model]['prompt_tokens'] + usage['completion_tokens'] * PRICING[model]['completion_tokens']:.6f}"
-            )
+            print(f"  Prompt tokens: {prompt_tokens}")
+            print(f"  Completion tokens: {completion_tokens}")
+            print(f"  Total tokens: {total_tokens}")
+            print(f"  Cost: ${cost:.6f}")
             print("----------------------------")
-        total_cost = sum(
-            usage["prompt_tokens"] * PRICING[model]["prompt_tokens"]
-            + usage["completion_tokens"] * PRICING[model]["completion_tokens"]
-            for model, usage in token_usage.items()
-        )
+        if not global_usage:
+            print(f"Cache hits: {self.cache_hits}")
         print(f"Total cost: ${total_cost:.6f}")
 
     def create_user_message_with_images(
@@ -214,7 +835,7 @@ class LLMClient:
                     ChatCompletionContentPartImageParam(
                         type="image_url",
                         image_url=ImageURL(
-                            url=f"data:image/png;base64,{image_base64}",
+                            url=self._get_image_data_url(image_base64),
                             detail=detail,
                         ),
                     )
@@ -222,6 +843,22 @@ class LLMClient:
 
         return ChatCompletionUserMessageParam(role="user", content=content)
 
+    def _get_image_data_url(self, image_base64: str) -> str:
+        """Get the data URL for a base64-encoded image
+
+        Screenshots are attached to several messages across steps, so their
+        multi-megabyte data URLs are built once and shared.
+        """
+        data_url = self.image_data_urls.get(image_base64)
+        if data_url is not None:
+            self.image_data_urls.move_to_end(image_base64)
+            return data_url
+        data_url = f"data:{get_image_mime_type(image_base64)};base64,{image_base64}"
+        self.image_data_urls[image_base64] = data_url
+        if len(self.image_data_urls) > IMAGE_DATA_URL_CACHE_SIZE:
+            self.image_data_urls.popitem(last=False)
+        return data_url
+
     def format_message_history(
         self, message_history: List[Dict[str, Any] | ChatCompletionMessageParam]
     ) -> str:
@@ -233,50 +870,51 @@ class LLMClient:
         Returns:
             A formatted string representation of the message history
         """
-        formatted_output = []
+        buffer = io.StringIO()
+        write = buffer.write
 
         for message in message_history:
-            # Convert ChatCompletionMessage to dict if needed
+            # Read ChatCompletionMessage fields directly instead of dumping the
+            # whole model to a dict
             if isinstance(message, ChatCompletionMessage):
-                message = message.model_dump()
+                role = message.role
+                content = message.content
+                tool_calls = message.tool_calls
+            else:
+                role = message.get("role", "UNKNOWN")
+                content = message.get("content")
+                tool_calls = message.get("tool_calls")
 
             # Add a clear header for each message
-            role = message.get("role", "UNKNOWN").upper()
-            formatted_output.append(f"=== {role} MESSAGE ===")
+            write(f"=== {role.upper()} MESSAGE ===\n")
 
-            # Process message content
-            content = message.get("content")
+            # Process message content, indenting each line of text
             if content is not None:
                 if isinstance(content, list):
                     # Handle multi-part content (text and images)
                     for content_item in content:
                         if content_item.get("type") == "text":
-                            # Format text content with indentation
-                            text_lines = content_item.get("text", "").split("\n")
-                            for line in text_lines:
-                                formatted_output.append(f"  {line}")
+                            text = content_item.get("text", "")
+                            write("  " + text.replace("\n", "\n  ") + "\n")
                         elif content_item.get("type") == "image_url":
-                            formatted_output.append("  [IMAGE ATTACHMENT]")
+                            write("  [IMAGE ATTACHMENT]\n")
                 else:
                     # Handle simple string content
-                    text_lines = str(content).split("\n")
-                    for line in text_lines:
-                        formatted_output.append(f"  {line}")
+                    text = str(content)
+                    write("  " + text.replace("\n", "\n  ") + "\n")
 
             # Handle tool calls
-            tool_calls = message.get("tool_calls")
             if tool_calls:
-                formatted_output.append("  [TOOL CALLS]")
+                write("  [TOOL CALLS]\n")
                 for i, tool_call in enumerate(tool_calls, 1):
-                    formatted_output.append(f"  Tool Call #{i}:")
-                    formatted_output.append(f"    {tool_call}")
+                    if isinstance(tool_call, BaseModel):
+                        tool_call = tool_call.model_dump_json()
+                    write(f"  Tool Call #{i}:\n    {tool_call}\n")
 
             # Add separator between messages
-            formatted_output.append("")
-            formatted_output.append("-" * 50)
-            formatted_output.append("")
+            write(f"\n{'-' * 50}\n\n")
 
-        return "\n".join(formatted_output)
+        return buffer.getvalue()
 
     def print_message_history(
         self, message_history: List[Union[Dict[str, Any], ChatCompletionMessageParam]]
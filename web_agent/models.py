@@ -5,6 +5,7 @@ from typing import Any
 from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
 )
+from pydantic import BaseModel, Field
 
 
 @dataclass
@@ -25,9 +26,16 @@ class AgentAction:
             return f"Action: {self.name}\nArgs: {json.dumps(self.args, indent=4)}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BrowserTab:
     index: int
     title: str
     url: str
     is_focused: bool
+
+
+class CaptchaDetection(BaseModel):
+    reasoning: str = Field(
+        description="brief explanation of why you think this is or isn't a captcha"
+    )
+    is_captcha: bool
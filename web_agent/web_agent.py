@@ -1,6 +1,10 @@
-import json
+import asyncio
 import os
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import orjson
 
 from web_agent.agent.agent import Agent
 from web_agent.browser.core.browser import AgentBrowser
@@ -16,6 +20,7 @@ class WebAgent:
         max_iterations: int = 20,
         headless: bool = False,
         model: str = "gpt-4.1",
+        llm_cache_path: Optional[str] = None,
     ):
         self.objective = objective
         self.model = model
@@ -23,7 +28,7 @@ class WebAgent:
             output_dir or f"runs/{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         )
         os.makedirs(self.output_dir, exist_ok=True)
-        self.llm_client = LLMClient()
+        self.llm_client = LLMClient(disk_cache_path=llm_cache_path)
 
         self.browser = AgentBrowser(
             initial_url, self.output_dir, headless, self.llm_client
@@ -49,11 +54,14 @@ class WebAgent:
             execution_time,
         ) = await agent.run()
         print(result)
-        self.save_run(result, message_history, url_history, iterations, execution_time)
+        await self.save_run(
+            result, message_history, url_history, iterations, execution_time
+        )
 
         await self.browser.terminate()
+        await self.llm_client.aclose()
 
-    def save_run(
+    async def save_run(
         self,
         final_response,
         message_history,
@@ -66,20 +74,22 @@ class WebAgent:
         prettified_message_history = self.llm_client.format_message_history(
             message_history
         )
-        with open(os.path.join(self.output_dir, "metadata.json"), "w") as f:
-            json.dump(
-                {
-                    "objective": self.objective,
-                    "initial_url": self.browser.initial_url,
-                    "iterations": iterations,
-                    "final_response": final_response,
-                    "url_history": url_history,
-                    "execution_time": execution_time,
-                    "token_usage": token_usage,
-                    "run_cost": total_cost,
-                    "primary_model": self.model,
-                    "message_history": prettified_message_history,
-                },
-                f,
-                indent=4,
-            )
+        metadata = orjson.dumps(
+            {
+                "objective": self.objective,
+                "initial_url": self.browser.initial_url,
+                "iterations": iterations,
+                "final_response": final_response,
+                "url_history": url_history,
+                "execution_time": execution_time,
+                "token_usage": token_usage,
+                "run_cost": total_cost,
+                "primary_model": self.model,
+                "message_history": prettified_message_history,
+            },
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+        # Write off the event loop, since the metadata can be large
+        await asyncio.to_thread(
+            Path(self.output_dir, "metadata.json").write_bytes, metadata
+        )